@@ -0,0 +1,34 @@
+"""add registered_count to events
+
+Revision ID: 2c9ca7f396dc
+Revises: a2f99e4b870a
+Create Date: 2026-10-17 09:00:12.481203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2c9ca7f396dc'
+down_revision = 'a2f99e4b870a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('events', sa.Column('registered_count', sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill from existing registrations
+    op.execute(
+        """
+        UPDATE events
+        SET registered_count = (
+            SELECT COUNT(*) FROM registrations WHERE registrations.event_id = events.id
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('events', 'registered_count')
@@ -0,0 +1,44 @@
+"""unique registration per user and event
+
+Revision ID: 56cd160fc542
+Revises: 2c9ca7f396dc
+Create Date: 2026-10-17 09:15:40.902716
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '56cd160fc542'
+down_revision = '2c9ca7f396dc'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Drop duplicate registrations left by the old check-then-insert race (keep the earliest)
+    op.execute(
+        """
+        DELETE FROM registrations
+        WHERE id NOT IN (
+            SELECT MIN(id) FROM registrations GROUP BY user_id, event_id
+        )
+        """
+    )
+
+    # Duplicates were counted, so recompute the counters
+    op.execute(
+        """
+        UPDATE events
+        SET registered_count = (
+            SELECT COUNT(*) FROM registrations WHERE registrations.event_id = events.id
+        )
+        """
+    )
+
+    op.create_unique_constraint('uq_registrations_user_event', 'registrations', ['user_id', 'event_id'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_registrations_user_event', 'registrations', type_='unique')
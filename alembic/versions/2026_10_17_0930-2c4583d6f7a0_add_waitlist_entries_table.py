@@ -0,0 +1,37 @@
+"""add waitlist entries table
+
+Revision ID: 2c4583d6f7a0
+Revises: 56cd160fc542
+Create Date: 2026-10-17 09:30:05.118734
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2c4583d6f7a0'
+down_revision = '56cd160fc542'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('waitlist_entries',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('event_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['event_id'], ['events.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'event_id', name='uq_waitlist_entries_user_event')
+    )
+    op.create_index(op.f('ix_waitlist_entries_id'), 'waitlist_entries', ['id'], unique=False)
+    op.create_index('ix_waitlist_entries_event_id_id', 'waitlist_entries', ['event_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_waitlist_entries_event_id_id', table_name='waitlist_entries')
+    op.drop_index(op.f('ix_waitlist_entries_id'), table_name='waitlist_entries')
+    op.drop_table('waitlist_entries')
@@ -0,0 +1,24 @@
+"""add event time range index
+
+Revision ID: 205eeb690019
+Revises: 2c4583d6f7a0
+Create Date: 2026-10-17 09:45:51.337920
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '205eeb690019'
+down_revision = '2c4583d6f7a0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_events_start_time_end_time', 'events', ['start_time', 'end_time'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_events_start_time_end_time', table_name='events')
@@ -0,0 +1,37 @@
+"""add foreign key and hot path indexes
+
+Revision ID: ce1235d8fc05
+Revises: 205eeb690019
+Create Date: 2026-10-17 10:00:27.654018
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'ce1235d8fc05'
+down_revision = '205eeb690019'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # registrations.user_id is already covered by uq_registrations_user_event (user_id, event_id)
+    op.create_index(op.f('ix_registrations_event_id'), 'registrations', ['event_id'], unique=False)
+    op.create_index(op.f('ix_notifications_user_id'), 'notifications', ['user_id'], unique=False)
+    op.create_index('ix_notifications_delivered_notify_at', 'notifications', ['delivered', 'notify_at'], unique=False)
+    op.create_index(op.f('ix_event_media_event_id'), 'event_media', ['event_id'], unique=False)
+    op.create_index(op.f('ix_events_category'), 'events', ['category'], unique=False)
+    op.create_index(op.f('ix_events_club'), 'events', ['club'], unique=False)
+    op.create_index(op.f('ix_events_created_by'), 'events', ['created_by'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_events_created_by'), table_name='events')
+    op.drop_index(op.f('ix_events_club'), table_name='events')
+    op.drop_index(op.f('ix_events_category'), table_name='events')
+    op.drop_index(op.f('ix_event_media_event_id'), table_name='event_media')
+    op.drop_index('ix_notifications_delivered_notify_at', table_name='notifications')
+    op.drop_index(op.f('ix_notifications_user_id'), table_name='notifications')
+    op.drop_index(op.f('ix_registrations_event_id'), table_name='registrations')
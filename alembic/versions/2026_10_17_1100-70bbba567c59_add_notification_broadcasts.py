@@ -0,0 +1,45 @@
+"""add notification broadcasts
+
+Revision ID: 70bbba567c59
+Revises: ce1235d8fc05
+Create Date: 2026-10-17 11:00:12.408311
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '70bbba567c59'
+down_revision = 'ce1235d8fc05'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('notification_broadcasts',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('event_id', sa.Integer(), nullable=False),
+    sa.Column('created_by', sa.Integer(), nullable=True),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('body', sa.String(), nullable=False),
+    sa.Column('recipient_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['event_id'], ['events.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_notification_broadcasts_event_id'), 'notification_broadcasts', ['event_id'], unique=False)
+    op.create_index(op.f('ix_notification_broadcasts_id'), 'notification_broadcasts', ['id'], unique=False)
+    op.add_column('notifications', sa.Column('broadcast_id', sa.Integer(), nullable=True))
+    op.create_index(op.f('ix_notifications_broadcast_id'), 'notifications', ['broadcast_id'], unique=False)
+    op.create_foreign_key('notifications_broadcast_id_fkey', 'notifications', 'notification_broadcasts', ['broadcast_id'], ['id'], ondelete='SET NULL')
+
+
+def downgrade() -> None:
+    op.drop_constraint('notifications_broadcast_id_fkey', 'notifications', type_='foreignkey')
+    op.drop_index(op.f('ix_notifications_broadcast_id'), table_name='notifications')
+    op.drop_column('notifications', 'broadcast_id')
+    op.drop_index(op.f('ix_notification_broadcasts_id'), table_name='notification_broadcasts')
+    op.drop_index(op.f('ix_notification_broadcasts_event_id'), table_name='notification_broadcasts')
+    op.drop_table('notification_broadcasts')
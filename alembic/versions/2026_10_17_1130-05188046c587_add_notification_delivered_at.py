@@ -0,0 +1,28 @@
+"""add notification delivered_at
+
+Revision ID: 05188046c587
+Revises: 2f549ae806c5
+Create Date: 2026-10-17 11:30:05.182734
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '05188046c587'
+down_revision = '2f549ae806c5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('notifications', sa.Column('delivered_at', sa.DateTime(), nullable=True))
+    # Best guess for rows delivered before the column existed
+    op.execute("UPDATE notifications SET delivered_at = notify_at WHERE delivered = true AND delivered_at IS NULL")
+    op.create_index('ix_notifications_user_id_delivered_at', 'notifications', ['user_id', 'delivered_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_notifications_user_id_delivered_at', table_name='notifications')
+    op.drop_column('notifications', 'delivered_at')
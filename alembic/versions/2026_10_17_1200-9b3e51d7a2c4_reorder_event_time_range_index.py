@@ -0,0 +1,28 @@
+"""reorder event time range index
+
+Revision ID: 9b3e51d7a2c4
+Revises: 05188046c587
+Create Date: 2026-10-17 12:00:12.418305
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9b3e51d7a2c4'
+down_revision = '05188046c587'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The conflict check scans by end_time (events still running at the new event's start);
+    # start_time-first could not bound that range
+    op.create_index('ix_events_end_time_start_time', 'events', ['end_time', 'start_time'], unique=False)
+    op.drop_index('ix_events_start_time_end_time', table_name='events')
+
+
+def downgrade() -> None:
+    op.create_index('ix_events_start_time_end_time', 'events', ['start_time', 'end_time'], unique=False)
+    op.drop_index('ix_events_end_time_start_time', table_name='events')
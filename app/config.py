@@ -6,11 +6,27 @@ class Settings(BaseSettings):
     print("Loading configuration settings...")
     # Database
     DATABASE_URL: str
+    ASYNC_DB_ENABLED: bool = False  # Serve the hot read paths and registration from async routes
+    ASYNC_DATABASE_URL: str | None = None  # Defaults to DATABASE_URL with the async driver (asyncpg / aiosqlite)
+    # Connection pool (per process, per engine): workers x (size + overflow) must stay below Postgres max_connections
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30  # Seconds a request waits for a free connection before failing
+    DB_POOL_RECYCLE: int = -1  # Reopen connections older than this (seconds, -1 = never); e.g. 1800 behind idle-killing proxies
+    DB_POOL_PRE_PING: bool = True  # Test each connection on checkout; False relies on DB_POOL_RECYCLE only
+    # Read replicas (comma-separated URLs); read-only GET routes are spread over them round-robin
+    DATABASE_REPLICA_URLS: str = ""
+    REPLICA_HEALTH_CHECK_SECONDS: int = 10  # Unreachable replicas are skipped until a check succeeds again
+    READ_YOUR_WRITES_SECONDS: int = 10  # After a write, that user's reads stay on the primary (should exceed replica lag)
+    REPLICA_CONNECT_TIMEOUT_SECONDS: int = 3  # A replica that doesn't answer in time counts as down; reads go to the primary
+    REPLICA_STATEMENT_TIMEOUT_SECONDS: int = 30  # Cancels queries stuck on a hung replica
     
     # JWT
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 480
+    AUTH_CACHE_TTL_SECONDS: int = 60  # How long a decoded token / user snapshot is reused (bounds staleness across workers)
+    AUTH_CACHE_MAX_ENTRIES: int = 10000
     
     # API
     API_V1_PREFIX: str = "/api"
@@ -37,10 +53,45 @@ class Settings(BaseSettings):
     
     # Brevo (Sendinblue)
     BREVO_API_KEY: str | None = None
+    BREVO_API_URL: str = "https://api.brevo.com/v3/smtp/email"
+    BREVO_CONNECT_TIMEOUT_SECONDS: float = 3.0
+    BREVO_READ_TIMEOUT_SECONDS: float = 10.0
+    BREVO_MAX_RETRIES: int = 3  # Failed connects and 429/503 responses only, with exponential backoff
+    BREVO_BACKOFF_SECONDS: float = 0.5
+    BREVO_MAX_CONCURRENCY: int = 10  # In-flight Brevo requests (also the connection pool size)
+
+    # Email outbox
+    EMAIL_OUTBOX_POLL_SECONDS: int = 5
+    EMAIL_OUTBOX_BATCH_SIZE: int = 50  # Emails claimed per worker transaction / sent per Brevo request
+    EMAIL_OUTBOX_MAX_ATTEMPTS: int = 5  # After this many failed sends the email is marked failed
+    EMAIL_OUTBOX_RETRY_SECONDS: int = 60  # Base delay before a retry, doubled on every attempt
+
+    # Notifications
+    RUN_SCHEDULER_IN_WEB: bool = True  # Set False when a separate `python -m app.worker` process runs the jobs
+    SCHEDULER_LEADER_ELECTION: bool = True  # Only one replica/process runs the scheduled jobs
+    LEADER_HEARTBEAT_SECONDS: int = 5  # How quickly a standby takes over from a dead leader
+    LEADER_LOCK_FILE: str | None = None  # Lock file used instead of a Postgres advisory lock (defaults to the temp dir)
+    REMINDER_PRELOAD_LIMIT: int = 1000  # Upcoming notify_at times kept in the in-memory heap
+    REMINDER_RESYNC_SECONDS: int = 300  # Safety-net reload of the heap from the DB
+    NOTIFICATION_BATCH_SIZE: int = 500  # Due notifications claimed per dispatcher transaction / sent per FCM send_each call (max 500)
+
+    # Registrations
+    OPEN_ENDED_EVENT_MINUTES: int = 120  # Assumed length of events without an end_time (schedule conflicts)
+
+    # Registration exports
+    EXPORT_DIR: str = "exports"
+    EXPORT_ASYNC_THRESHOLD: int = 5000  # Registrants above which the export runs as a background job
+    EXPORT_JOB_TTL_MINUTES: int = 60  # Finished jobs are deleted this long after finishing
+    EXPORT_CLEANUP_MINUTES: int = 5  # How often each web process sweeps EXPORT_DIR
+    EXPORT_WORKERS: int = 2
     
     @property
     def allowed_origins_list(self) -> List[str]:
         return [origin.strip() for origin in self.ALLOWED_ORIGINS.split(",")]
+
+    @property
+    def replica_urls_list(self) -> List[str]:
+        return [url.strip() for url in self.DATABASE_REPLICA_URLS.split(",") if url.strip()]
     
     class Config:
         env_file = ".env"
@@ -0,0 +1,92 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+from app.config import settings
+
+
+@dataclass(frozen=True)
+class UserSnapshot:
+    """
+    The user fields authorization needs, cached so most requests skip the user lookup.
+    Routes that change the user or need other columns load the row themselves.
+    """
+    id: int
+    is_admin: bool
+    is_super_admin: bool
+    is_active: bool
+    fcm_token: Optional[str]
+
+    @classmethod
+    def from_user(cls, user) -> "UserSnapshot":
+        return cls(
+            id=user.id,
+            is_admin=bool(user.is_admin),
+            is_super_admin=bool(user.is_super_admin),
+            is_active=bool(user.is_active),
+            fcm_token=user.fcm_token,
+        )
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries also expire after a per-entry TTL.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped on every delete, so a load that raced with an invalidation isn't stored
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= now:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl_seconds: Optional[float] = None, version: Optional[int] = None):
+        ttl = self.ttl_seconds if ttl_seconds is None else min(ttl_seconds, self.ttl_seconds)
+        if ttl <= 0:
+            return
+
+        with self._lock:
+            if version is not None and version != self._version:
+                return
+            self._data[key] = (value, time.monotonic() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._version += 1
+            self._data.pop(key, None)
+
+
+# token -> TokenData (decoded and verified JWT), never kept past the token's own expiry
+token_cache = TTLCache(settings.AUTH_CACHE_MAX_ENTRIES, settings.AUTH_CACHE_TTL_SECONDS)
+# user id -> UserSnapshot
+user_cache = TTLCache(settings.AUTH_CACHE_MAX_ENTRIES, settings.AUTH_CACHE_TTL_SECONDS)
+
+
+def invalidate_user(user_id: int):
+    """
+    Drop the cached snapshot after changing a user. Per process: other workers
+    see the change once their entry expires (AUTH_CACHE_TTL_SECONDS).
+    """
+    user_cache.delete(user_id)
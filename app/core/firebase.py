@@ -25,9 +25,11 @@ def init_firebase():
         _firebase_initialized = True
 
 
-def send_fcm(token: str, title: str, body: str, sticky: bool = False):
-    init_firebase()
+# FCM accepts at most 500 messages per send_each call
+FCM_MAX_BATCH_SIZE = 500
 
+
+def build_fcm_message(token: str, title: str, body: str, sticky: bool = False) -> messaging.Message:
     # Android specific config to make it "sticky" (ongoing)
     android_config = messaging.AndroidConfig(
         priority='high',
@@ -39,7 +41,7 @@ def send_fcm(token: str, title: str, body: str, sticky: bool = False):
         )
     )
 
-    message = messaging.Message(
+    return messaging.Message(
         notification=messaging.Notification(
             title=title,
             body=body,
@@ -48,4 +50,37 @@ def send_fcm(token: str, title: str, body: str, sticky: bool = False):
         token=token,
     )
 
-    messaging.send(message)
+
+def send_fcm(token: str, title: str, body: str, sticky: bool = False):
+    init_firebase()
+
+    messaging.send(build_fcm_message(token, title, body, sticky))
+
+
+def send_fcm_batch(messages: list[dict]) -> list[dict]:
+    """
+    Send many pushes with send_each, up to FCM_MAX_BATCH_SIZE per HTTP call.
+    `messages` are dicts with token/title/body/sticky. Returns one result per message, in order:
+    {"token", "success", "message_id", "error", "unregistered"}.
+    """
+    init_firebase()
+
+    results = []
+    for i in range(0, len(messages), FCM_MAX_BATCH_SIZE):
+        chunk = messages[i:i + FCM_MAX_BATCH_SIZE]
+        batch = messaging.send_each([
+            build_fcm_message(m["token"], m["title"], m["body"], m.get("sticky", False))
+            for m in chunk
+        ])
+
+        for m, response in zip(chunk, batch.responses):
+            results.append({
+                "token": m["token"],
+                "success": response.success,
+                "message_id": response.message_id,
+                "error": str(response.exception) if response.exception else None,
+                # Token no longer valid (app uninstalled / token rotated)
+                "unregistered": isinstance(response.exception, messaging.UnregisteredError),
+            })
+
+    return results
@@ -0,0 +1,153 @@
+import os
+import tempfile
+import threading
+import zlib
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import NullPool
+from app.config import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows: no flock, local runs are single-instance anyway
+    fcntl = None
+
+# Probes without an answer before a connection is declared dead
+KEEPALIVE_PROBES = 3
+
+
+def lock_connect_args() -> dict:
+    """
+    libpq options for the lock connection, so a dead peer is noticed within a few heartbeats
+    instead of the kernel's TCP timeout (hours).
+    Server side: Postgres drops a dead leader's session, releasing its advisory lock.
+    Client side: the heartbeat's SELECT 1 fails instead of hanging when the server is gone.
+    """
+    seconds = max(settings.LEADER_HEARTBEAT_SECONDS, 1)
+    return {
+        "keepalives": 1,
+        "keepalives_idle": seconds,
+        "keepalives_interval": seconds,
+        "keepalives_count": KEEPALIVE_PROBES,
+        "tcp_user_timeout": seconds * KEEPALIVE_PROBES * 1000,
+        "connect_timeout": seconds,
+        "options": (
+            f"-c tcp_keepalives_idle={seconds}"
+            f" -c tcp_keepalives_interval={seconds}"
+            f" -c tcp_keepalives_count={KEEPALIVE_PROBES}"
+            f" -c tcp_user_timeout={seconds * KEEPALIVE_PROBES * 1000}"
+            f" -c statement_timeout={seconds * 1000}"
+        ),
+    }
+
+
+class LeaderElector:
+    """
+    Makes sure only one replica runs the scheduled jobs.
+
+    On Postgres the leader holds a session-level advisory lock on a dedicated connection;
+    if the leader dies its connection closes (or times out, see lock_connect_args), the lock
+    is released and the next heartbeat of another replica picks it up. The leader pings
+    the connection on every heartbeat and steps down as soon as it fails. Elsewhere (SQLite / local dev) an
+    exclusive file lock plays the same role for processes on one machine.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.key = zlib.crc32(name.encode("utf-8"))
+        self.use_advisory_lock = settings.DATABASE_URL.startswith(("postgres://", "postgresql"))
+        self._is_leader = False
+        self._mutex = threading.Lock()
+        self._engine = None
+        self._conn = None
+        self._lock_file = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self._is_leader
+
+    def heartbeat(self) -> bool:
+        """
+        Confirm we still hold leadership, or try to take it. Call every few seconds.
+        """
+        with self._mutex:
+            if self._is_leader and not self._still_holding():
+                print(f"Lost {self.name} leadership")
+                self._release()
+
+            if not self._is_leader:
+                self._is_leader = self._acquire()
+                if self._is_leader:
+                    print(f"Acquired {self.name} leadership (pid {os.getpid()})")
+
+            return self._is_leader
+
+    def _acquire(self) -> bool:
+        try:
+            if self.use_advisory_lock:
+                return self._acquire_advisory_lock()
+            return self._acquire_file_lock()
+        except Exception as e:
+            print(f"Leader election for {self.name} failed: {e}")
+            self._release()
+            return False
+
+    def _acquire_advisory_lock(self) -> bool:
+        if self._engine is None:
+            # Own connection outside the app pool; AUTOCOMMIT so it never sits idle in a transaction
+            self._engine = create_engine(
+                settings.DATABASE_URL,
+                poolclass=NullPool,
+                isolation_level="AUTOCOMMIT",
+                connect_args=lock_connect_args(),
+            )
+
+        self._conn = self._engine.connect()
+        acquired = self._conn.execute(
+            text("SELECT pg_try_advisory_lock(:key)"), {"key": self.key}
+        ).scalar()
+
+        if not acquired:
+            self._conn.close()
+            self._conn = None
+        return bool(acquired)
+
+    def _acquire_file_lock(self) -> bool:
+        if fcntl is None:
+            return True
+
+        path = settings.LEADER_LOCK_FILE or os.path.join(tempfile.gettempdir(), f"{self.name}.lock")
+        self._lock_file = open(path, "a+")
+        try:
+            fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except OSError:
+            self._lock_file.close()
+            self._lock_file = None
+            return False
+
+    def _still_holding(self) -> bool:
+        if not self.use_advisory_lock:
+            # flock is held for as long as the file stays open
+            return True
+
+        # Bounded by statement_timeout / tcp_user_timeout, so a dead connection fails fast
+        try:
+            self._conn.execute(text("SELECT 1"))
+            return True
+        except Exception as e:
+            print(f"{self.name} lock connection failed: {e}")
+            return False
+
+    def _release(self):
+        self._is_leader = False
+
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+            self._conn = None
+
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
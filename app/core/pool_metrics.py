@@ -0,0 +1,158 @@
+import threading
+import time
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Upper bounds (seconds) of the histogram buckets
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+HOLD_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class Histogram:
+    """
+    Cumulative Prometheus-style histogram (per process).
+    """
+
+    def __init__(self, buckets: tuple):
+        self.lock = threading.Lock()
+        self.buckets = buckets
+        self.bucket_counts = [0] * len(buckets)
+        self.count = 0
+        self.total_seconds = 0.0
+
+    def observe(self, seconds: float):
+        with self.lock:
+            self.count += 1
+            self.total_seconds += seconds
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    self.bucket_counts[i] += 1
+                    break
+
+
+class PoolStats:
+    """
+    Per-engine pool statistics; kept across engine.dispose(), which replaces the pool.
+    """
+
+    def __init__(self):
+        self.wait = Histogram(WAIT_BUCKETS)
+        self.hold = Histogram(HOLD_BUCKETS)
+        self.timeouts = 0
+
+
+class TimedPoolMixin:
+    """
+    Times Pool.connect(), i.e. how long a request waited for a usable connection (queueing,
+    opening a new one, pre-ping). No pool event fires before the wait, so this wraps the
+    public connect() method; how long connections stay checked out comes from the
+    checkout/checkin events (see register_pool).
+    """
+
+    stats: PoolStats = None
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except PoolTimeoutError:
+            if self.stats is not None:
+                self.stats.timeouts += 1
+            raise
+        finally:
+            if self.stats is not None:
+                self.stats.wait.observe(time.perf_counter() - start)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+class TimedQueuePool(TimedPoolMixin, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+# name -> (sync) engine; the engine's current pool is read at scrape time (dispose() replaces it)
+_engines = {}
+
+
+def register_pool(name: str, engine):
+    stats = PoolStats()
+    if isinstance(engine.pool, TimedPoolMixin):
+        engine.pool.stats = stats
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        connection_record.info["checked_out_at"] = time.perf_counter()
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        checked_out_at = connection_record.info.pop("checked_out_at", None)
+        if checked_out_at is not None:
+            stats.hold.observe(time.perf_counter() - checked_out_at)
+
+    _engines[name] = engine
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def render_pool_metrics() -> str:
+    """
+    Prometheus text exposition for every registered pool.
+    """
+    lines = [
+        "# HELP db_pool_size Configured number of persistent connections.",
+        "# TYPE db_pool_size gauge",
+        "# HELP db_pool_checked_out Connections currently in use.",
+        "# TYPE db_pool_checked_out gauge",
+        "# HELP db_pool_checked_in Idle connections in the pool.",
+        "# TYPE db_pool_checked_in gauge",
+        "# HELP db_pool_overflow Connections open beyond pool_size.",
+        "# TYPE db_pool_overflow gauge",
+        "# HELP db_pool_checkout_timeouts_total Checkouts that gave up after pool_timeout.",
+        "# TYPE db_pool_checkout_timeouts_total counter",
+        "# HELP db_pool_checkout_wait_seconds Time spent waiting for a connection.",
+        "# TYPE db_pool_checkout_wait_seconds histogram",
+        "# HELP db_pool_connection_hold_seconds Time a connection stayed checked out.",
+        "# TYPE db_pool_connection_hold_seconds histogram",
+    ]
+
+    for name, engine in _engines.items():
+        pool = engine.pool
+        if not isinstance(pool, TimedPoolMixin) or pool.stats is None:
+            continue
+
+        label = f'pool="{_escape(name)}"'
+        lines.append(f"db_pool_size{{{label}}} {pool.size()}")
+        lines.append(f"db_pool_checked_out{{{label}}} {pool.checkedout()}")
+        lines.append(f"db_pool_checked_in{{{label}}} {pool.checkedin()}")
+        # QueuePool.overflow() goes negative while fewer than pool_size connections are open
+        lines.append(f"db_pool_overflow{{{label}}} {max(pool.overflow(), 0)}")
+
+        stats = pool.stats
+        lines.append(f"db_pool_checkout_timeouts_total{{{label}}} {stats.timeouts}")
+        lines.extend(_histogram_lines("db_pool_checkout_wait_seconds", label, stats.wait))
+        lines.extend(_histogram_lines("db_pool_connection_hold_seconds", label, stats.hold))
+
+    return "\n".join(lines) + "\n"
+
+
+def _histogram_lines(metric: str, label: str, histogram: Histogram) -> list[str]:
+    with histogram.lock:
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(histogram.buckets, histogram.bucket_counts):
+            cumulative += bucket_count
+            lines.append(f'{metric}_bucket{{{label},le="{bound}"}} {cumulative}')
+        lines.append(f'{metric}_bucket{{{label},le="+Inf"}} {histogram.count}')
+        lines.append(f"{metric}_sum{{{label}}} {histogram.total_seconds:.6f}")
+        lines.append(f"{metric}_count{{{label}}} {histogram.count}")
+        return lines
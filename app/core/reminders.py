@@ -0,0 +1,227 @@
+import heapq
+import logging
+import select as select_module
+import threading
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, event, select, text
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+from app.config import settings
+from app.database import SessionLocal, engine
+from app.models import Notification
+
+# Postgres channel used to tell the dispatcher (possibly another process) about new reminders
+REMINDER_CHANNEL = "notification_scheduled"
+# Reconnect delay of the LISTEN connection, doubled after every failed attempt
+LISTEN_RETRY_SECONDS = 1
+LISTEN_RETRY_MAX_SECONDS = 60
+# A quiet LISTEN connection is pinged this often, so a dead one is noticed and replaced
+LISTEN_PING_SECONDS = 60
+# Reminders still undelivered right after a dispatch (failed push, rows locked by another
+# dispatcher) are retried after this delay instead of immediately
+REDISPATCH_DELAY_SECONDS = 5
+
+logger = logging.getLogger(__name__)
+
+
+class ReminderQueue:
+    """
+    In-memory min-heap of upcoming notify_at timestamps (naive UTC).
+
+    The loop thread sleeps until the earliest one is due and then runs the dispatcher,
+    which claims the rows from the DB. The heap is loaded from the DB on start and on
+    resync(); new reminders are pushed as they are created - directly when created in
+    this process, through Postgres LISTEN/NOTIFY when created by another one.
+
+    With leader election only the leader runs the queue (see app/core/scheduler.py):
+    start() when leadership is gained, stop() when it is lost.
+    """
+
+    def __init__(self):
+        self._heap: list[datetime] = []
+        self._cond = threading.Condition()
+        self._dispatch = None
+        # Bumped by start()/stop(); threads of an earlier run exit once it changes
+        self._generation = 0
+        # Past-due reminders found by resync() are not dispatched again before this time
+        self._redispatch_at = datetime.min
+        self.running = False
+
+    def start(self, dispatch):
+        with self._cond:
+            if self.running:
+                return
+            self._dispatch = dispatch
+            self._generation += 1
+            self._redispatch_at = datetime.min
+            self.running = True
+            generation = self._generation
+        self.resync()
+
+        threading.Thread(target=self._run, args=(generation,), name="reminder-queue", daemon=True).start()
+        if engine.dialect.name == "postgresql":
+            threading.Thread(target=self._listen, args=(generation,), name="reminder-listener", daemon=True).start()
+
+    def stop(self):
+        with self._cond:
+            if not self.running:
+                return
+            self.running = False
+            self._generation += 1
+            self._heap = []
+            self._cond.notify()
+
+    def _is_current(self, generation: int) -> bool:
+        return self.running and self._generation == generation
+
+    def push(self, notify_at: datetime):
+        with self._cond:
+            heapq.heappush(self._heap, notify_at)
+            # Only wake the loop if this is now the earliest reminder
+            if self._heap[0] == notify_at:
+                self._cond.notify()
+
+    def resync(self):
+        """
+        Reload the next REMINDER_PRELOAD_LIMIT due times from the DB (safety net for missed signals).
+        Does nothing while the queue is stopped.
+        """
+        if not self.running:
+            return
+
+        db = SessionLocal()
+        try:
+            upcoming = db.scalars(
+                select(Notification.notify_at)
+                .where(Notification.delivered == False)
+                .distinct()
+                .order_by(Notification.notify_at)
+                .limit(settings.REMINDER_PRELOAD_LIMIT)
+            ).all()
+        except Exception:
+            logger.exception("Reminder queue resync failed")
+            return
+        finally:
+            db.close()
+
+        with self._cond:
+            if not self.running:
+                return
+            # Rows that were due at the last dispatch and are still undelivered wait for the
+            # redispatch delay, so they don't turn the loop into dispatch/resync spinning
+            self._heap = sorted({max(notify_at, self._redispatch_at) for notify_at in upcoming})
+            self._cond.notify()
+
+    def _run(self, generation: int):
+        while True:
+            with self._cond:
+                if not self._is_current(generation):
+                    return
+                timeout = None
+                if self._heap:
+                    timeout = (self._heap[0] - datetime.utcnow()).total_seconds()
+                if timeout is None or timeout > 0:
+                    self._cond.wait(timeout)
+                if not self._is_current(generation):
+                    return
+
+                now = datetime.utcnow()
+                due = False
+                while self._heap and self._heap[0] <= now:
+                    heapq.heappop(self._heap)
+                    due = True
+                drained = not self._heap
+                if due:
+                    self._redispatch_at = now + timedelta(seconds=REDISPATCH_DELAY_SECONDS)
+
+            if not due:
+                continue
+
+            try:
+                self._dispatch()
+            except Exception:
+                logger.exception("Reminder dispatch failed")
+
+            # Only a window of reminders is kept in memory; fetch the next one
+            if drained:
+                self.resync()
+
+    def _listen(self, generation: int):
+        """
+        Feed NOTIFYs from other processes into the heap (psycopg2 only; otherwise rely on resync).
+        The connection is re-established with backoff whenever it drops.
+        """
+        # Dedicated connection kept outside the app pool for as long as the queue runs
+        listen_engine = create_engine(settings.DATABASE_URL, poolclass=NullPool)
+        delay = LISTEN_RETRY_SECONDS
+
+        while self._is_current(generation):
+            raw = None
+            try:
+                raw = listen_engine.raw_connection()
+                conn = raw.driver_connection
+                if not hasattr(conn, "poll"):
+                    logger.info("Reminder listener unavailable for this driver, relying on resync")
+                    return
+                conn.autocommit = True
+                conn.cursor().execute(f"LISTEN {REMINDER_CHANNEL}")
+                # Reminders announced while no connection was listening were missed
+                self.resync()
+                delay = LISTEN_RETRY_SECONDS
+                self._receive(conn, generation)
+            except Exception as e:
+                logger.warning("Reminder listener disconnected (%s), reconnecting in %ss", e, delay)
+            finally:
+                if raw is not None:
+                    try:
+                        raw.close()
+                    except Exception:
+                        pass
+
+            if not self._is_current(generation):
+                return
+            time.sleep(delay)
+            delay = min(delay * 2, LISTEN_RETRY_MAX_SECONDS)
+
+    def _receive(self, conn, generation: int):
+        """
+        Push NOTIFY payloads into the heap until the connection fails or the queue stops.
+        """
+        while self._is_current(generation):
+            if select_module.select([conn], [], [], LISTEN_PING_SECONDS) == ([], [], []):
+                # Nothing for a while: make sure the connection is still alive
+                conn.cursor().execute("SELECT 1")
+                continue
+            conn.poll()
+            while conn.notifies:
+                notify = conn.notifies.pop(0)
+                self.push(datetime.fromisoformat(notify.payload))
+
+
+reminder_queue = ReminderQueue()
+
+
+def announce_reminders(db: Session, notify_times: list[datetime]):
+    """
+    Signal new reminders once the caller's transaction commits.
+    Call before db.commit(); nothing is announced if the transaction rolls back.
+    """
+    times = sorted(set(notify_times))
+    if not times:
+        return
+
+    # NOTIFY is transactional, so listeners only hear about committed rows
+    if db.get_bind().dialect.name == "postgresql":
+        for notify_at in times:
+            db.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": REMINDER_CHANNEL, "payload": notify_at.isoformat()}
+            )
+
+    if reminder_queue.running:
+        def push_local(session):
+            for notify_at in times:
+                reminder_queue.push(notify_at)
+
+        event.listen(db, "after_commit", push_local, once=True)
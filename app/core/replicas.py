@@ -0,0 +1,202 @@
+import itertools
+import threading
+import time
+from typing import Optional
+from sqlalchemy import create_engine, make_url, text
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.core.leader import KEEPALIVE_PROBES
+from app.core.pool_metrics import TimedAsyncAdaptedQueuePool, TimedQueuePool, register_pool
+from app.database import AsyncSessionLocal, SessionLocal, async_database_url, pool_options
+
+# Read-your-writes deadline (unix time) handed to the client after a write and sent back on reads,
+# as a cookie or, for clients without a cookie jar, this request header. Carried by the client
+# rather than kept in memory, so it holds whichever web worker serves the next read.
+PRIMARY_PIN_COOKIE = "read_primary_until"
+PRIMARY_PIN_HEADER = "X-Read-Primary-Until"
+
+
+def replica_connect_args(url: str) -> dict:
+    """
+    Connect and statement timeouts plus TCP keepalives for a replica connection, so a hung
+    replica (as opposed to one refusing connections) fails fast instead of blocking the
+    request or the health check. Same idea as lock_connect_args in app/core/leader.py.
+    """
+    if make_url(url).get_backend_name() != "postgresql":
+        return {}
+
+    connect_timeout = settings.REPLICA_CONNECT_TIMEOUT_SECONDS
+    server_options = {
+        "statement_timeout": settings.REPLICA_STATEMENT_TIMEOUT_SECONDS * 1000,
+        "tcp_keepalives_idle": connect_timeout,
+        "tcp_keepalives_interval": connect_timeout,
+        "tcp_keepalives_count": KEEPALIVE_PROBES,
+    }
+
+    if make_url(url).get_driver_name() == "asyncpg":
+        return {
+            "timeout": connect_timeout,
+            "command_timeout": settings.REPLICA_STATEMENT_TIMEOUT_SECONDS,
+            "server_settings": {name: str(value) for name, value in server_options.items()},
+        }
+
+    return {
+        "keepalives": 1,
+        "keepalives_idle": connect_timeout,
+        "keepalives_interval": connect_timeout,
+        "keepalives_count": KEEPALIVE_PROBES,
+        "connect_timeout": connect_timeout,
+        "options": " ".join(f"-c {name}={value}" for name, value in server_options.items()),
+    }
+
+
+class ReplicaSet:
+    """
+    Round-robin over the read replicas that passed their last health check.
+    A background thread re-checks every replica each REPLICA_HEALTH_CHECK_SECONDS;
+    when none is healthy, callers fall back to the primary.
+    """
+
+    def __init__(self, urls: list[str]):
+        self.engines = []
+        # Same replicas for the ASYNC_DB_ENABLED routes, index-aligned with self.engines
+        self.async_engines = []
+        for i, url in enumerate(urls):
+            engine = create_engine(
+                url,
+                poolclass=TimedQueuePool,
+                echo=settings.DEBUG,
+                connect_args=replica_connect_args(url),
+                **pool_options()
+            )
+            register_pool(f"replica-{i}", engine)
+            self.engines.append(engine)
+
+            if settings.ASYNC_DB_ENABLED:
+                from sqlalchemy.ext.asyncio import create_async_engine
+
+                async_url = async_database_url(url)
+                async_engine = create_async_engine(
+                    async_url,
+                    poolclass=TimedAsyncAdaptedQueuePool,
+                    echo=settings.DEBUG,
+                    connect_args=replica_connect_args(async_url),
+                    **pool_options()
+                )
+                register_pool(f"replica-{i}-async", async_engine.sync_engine)
+                self.async_engines.append(async_engine)
+
+        # Assume healthy until the first check says otherwise
+        self._healthy = [True] * len(self.engines)
+        self._counter = itertools.count()
+        self._monitor_lock = threading.Lock()
+        self._monitor_started = False
+
+    def pick(self) -> Optional[int]:
+        """
+        Index of the next healthy replica, or None (use the primary).
+        """
+        if not self.engines:
+            return None
+        self._start_monitor()
+
+        healthy = [i for i, ok in enumerate(self._healthy) if ok]
+        if not healthy:
+            return None
+        return healthy[next(self._counter) % len(healthy)]
+
+    def check(self):
+        for i, engine in enumerate(self.engines):
+            try:
+                with engine.connect() as conn:
+                    conn.execute(text("SELECT 1"))
+                ok = True
+            except Exception as e:
+                ok = False
+                if self._healthy[i]:
+                    print(f"Replica {i} failed its health check, routing reads elsewhere: {e}")
+
+            if ok and not self._healthy[i]:
+                print(f"Replica {i} is healthy again")
+            self._healthy[i] = ok
+
+    def mark_down(self, index: int, error: Exception):
+        """
+        Skip a replica a request failed to connect to, until its next successful health check.
+        """
+        if self._healthy[index]:
+            print(f"Replica {index} failed a connection, routing reads elsewhere: {error}")
+        self._healthy[index] = False
+
+    def _start_monitor(self):
+        # Started lazily so scripts importing the app don't spawn a thread they never use
+        if self._monitor_started:
+            return
+        with self._monitor_lock:
+            if self._monitor_started:
+                return
+            self._monitor_started = True
+            threading.Thread(target=self._monitor, name="replica-health", daemon=True).start()
+
+    def _monitor(self):
+        while True:
+            self.check()
+            time.sleep(settings.REPLICA_HEALTH_CHECK_SECONDS)
+
+
+replica_set = ReplicaSet(settings.replica_urls_list)
+
+
+def primary_pin_value() -> str:
+    """
+    Pin deadline to hand out after a successful write.
+    """
+    return str(int(time.time()) + settings.READ_YOUR_WRITES_SECONDS)
+
+
+def is_primary_pinned(value: Optional[str]) -> bool:
+    """
+    True if the client sent back a pin deadline that hasn't passed yet.
+    """
+    try:
+        return float(value) > time.time()
+    except (TypeError, ValueError):
+        return False
+
+
+def read_session(pinned: bool = False) -> Session:
+    """
+    Session for a read-only request: a healthy replica, or the primary if the client
+    wrote something moments ago, no replica is configured or none is reachable.
+    The replica connection is opened up front, so a failed one falls back to the primary.
+    """
+    index = None if pinned else replica_set.pick()
+    if index is None:
+        return SessionLocal()
+
+    db = SessionLocal(bind=replica_set.engines[index])
+    try:
+        db.connection()
+    except Exception as e:
+        db.close()
+        replica_set.mark_down(index, e)
+        return SessionLocal()
+    return db
+
+
+async def async_read_session(pinned: bool = False):
+    """
+    AsyncSession counterpart of read_session (ASYNC_DB_ENABLED routes).
+    """
+    index = None if pinned else replica_set.pick()
+    if index is None:
+        return AsyncSessionLocal()
+
+    db = AsyncSessionLocal(bind=replica_set.async_engines[index])
+    try:
+        await db.connection()
+    except Exception as e:
+        await db.close()
+        replica_set.mark_down(index, e)
+        return AsyncSessionLocal()
+    return db
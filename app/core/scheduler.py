@@ -1,12 +1,83 @@
+from datetime import datetime
 from apscheduler.schedulers.background import BackgroundScheduler
+from app.config import settings
+from app.core.leader import LeaderElector
+from app.core.reminders import reminder_queue
+from app.services.email_outbox import deliver_outbox_emails
+from app.services.export_jobs import cleanup_expired_exports
 from app.services.notifications import send_due_notifications
 
 scheduler = BackgroundScheduler()
 
+# Only the elected replica runs the jobs; the others keep retrying the lock
+elector = LeaderElector("event-manager-scheduler")
+
+def run_if_leader(job):
+    def wrapper():
+        if elector.is_leader:
+            job()
+    wrapper.__name__ = job.__name__
+    return wrapper
+
+def leader_heartbeat():
+    if elector.heartbeat():
+        # Starting loads anything that came due while another replica was in charge
+        reminder_queue.start(run_if_leader(send_due_notifications))
+    else:
+        # Standbys keep no reminder queue, so they don't poll the notifications table
+        reminder_queue.stop()
+
+def add_jobs(target):
+    deliver_emails = deliver_outbox_emails
+
+    if settings.SCHEDULER_LEADER_ELECTION:
+        target.add_job(
+            leader_heartbeat,
+            "interval",
+            seconds=settings.LEADER_HEARTBEAT_SECONDS,
+            next_run_time=datetime.now(),  # try to take leadership right away
+            max_instances=1,
+        )
+        deliver_emails = run_if_leader(deliver_outbox_emails)
+
+    # Reminders are delivered by the reminder queue when they come due (no minute polling);
+    # the periodic resync only catches reminders whose signal was missed. With leader
+    # election the queue is started by leader_heartbeat once this process leads.
+    target.add_job(
+        reminder_queue.resync,
+        "interval",
+        seconds=settings.REMINDER_RESYNC_SECONDS,
+        max_instances=1,
+        coalesce=True,
+    )
+    if not settings.SCHEDULER_LEADER_ELECTION:
+        reminder_queue.start(send_due_notifications)
+
+    target.add_job(
+        deliver_emails,
+        "interval",
+        seconds=settings.EMAIL_OUTBOX_POLL_SECONDS,
+        max_instances=1,
+        coalesce=True,
+    )
+
 def start_scheduler():
+    add_jobs(scheduler)
+    scheduler.start()
+
+def start_export_cleanup():
+    """
+    Export jobs run in the web processes and their files live on the local disk, so every
+    web process sweeps EXPORT_DIR itself (no leader check), starting right away to fail
+    jobs orphaned by the restart.
+    """
     scheduler.add_job(
-        send_due_notifications,
+        cleanup_expired_exports,
         "interval",
-        minutes=1,   # checks every minute
+        minutes=settings.EXPORT_CLEANUP_MINUTES,
+        next_run_time=datetime.now(),
+        max_instances=1,
+        coalesce=True,
     )
-    scheduler.start()
+    if not scheduler.running:
+        scheduler.start()
@@ -2,18 +2,63 @@ from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.config import settings
+from app.core.pool_metrics import TimedAsyncAdaptedQueuePool, TimedQueuePool, register_pool
+
+
+def pool_options() -> dict:
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
 
 # Create database engine
 print(settings.DATABASE_URL)
 engine = create_engine(
     settings.DATABASE_URL,
-    pool_pre_ping=True,
-    echo=settings.DEBUG
+    poolclass=TimedQueuePool,
+    echo=settings.DEBUG,
+    **pool_options()
 )
+register_pool("primary", engine)
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+def async_database_url(url: str) -> str:
+    """
+    Swap the sync driver in DATABASE_URL for its asyncio counterpart.
+    """
+    if url.startswith("postgres://"):
+        url = "postgresql://" + url[len("postgres://"):]
+    if url.startswith("postgresql://") or url.startswith("postgresql+psycopg2://"):
+        return "postgresql+asyncpg://" + url.split("://", 1)[1]
+    if url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + url[len("sqlite://"):]
+    return url
+
+
+# Async engine/session, only created when enabled (needs asyncpg or aiosqlite installed)
+async_engine = None
+AsyncSessionLocal = None
+
+if settings.ASYNC_DB_ENABLED:
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    async_engine = create_async_engine(
+        settings.ASYNC_DATABASE_URL or async_database_url(settings.DATABASE_URL),
+        poolclass=TimedAsyncAdaptedQueuePool,
+        echo=settings.DEBUG,
+        **pool_options()
+    )
+    register_pool("async", async_engine.sync_engine)
+    # expire_on_commit=False: attributes can't be lazy-loaded after commit in async code
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 # Create Base class for models
 Base = declarative_base()
 
@@ -25,3 +70,9 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# Async variant of get_db for the routes in app/routers/async_routes.py
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,12 +1,16 @@
+import time
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.config import settings
-from app.database import get_db
+from app.core.auth_cache import UserSnapshot, token_cache, user_cache
+from app.core.replicas import PRIMARY_PIN_COOKIE, PRIMARY_PIN_HEADER, async_read_session, is_primary_pinned, read_session
+from app.database import get_async_db, get_db
 from app.models import User
 from app.schemas import TokenData
 
@@ -17,10 +21,12 @@ oauth2_scheme_optional = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_PREFIX
 
 # ... (existing functions)
 
-async def get_optional_current_user(
+# The user lookups below are plain `def` on purpose: FastAPI runs sync dependencies in its
+# threadpool, while an `async def` running a blocking SQLAlchemy query would stall the event loop
+def get_optional_current_user(
     token: str = Depends(oauth2_scheme_optional),
     db: Session = Depends(get_db)
-) -> Optional[User]:
+) -> Optional[UserSnapshot]:
     """
     Get the current authenticated user, but return None if not authenticated.
     """
@@ -30,12 +36,44 @@ async def get_optional_current_user(
     try:
         # verify_token raises 401 on failure, we catch it
         token_data = verify_token(token)
-        user = db.query(User).filter(User.id == token_data.user_id).first()
-        return user
+        return load_user_snapshot(db, token_data.user_id)
     except Exception:
         return None
 
 
+def pinned_to_primary(request: Request) -> bool:
+    """
+    True if the client wrote something moments ago (read-your-writes pin, see app/core/replicas.py).
+    """
+    return is_primary_pinned(
+        request.headers.get(PRIMARY_PIN_HEADER) or request.cookies.get(PRIMARY_PIN_COOKIE)
+    )
+
+
+def get_read_db(request: Request):
+    """
+    Like get_db, for read-only GET routes: the session may point at a read replica.
+    Clients who wrote something moments ago are kept on the primary (read-your-writes),
+    and a replica that can't be reached is skipped in favour of the primary.
+    """
+    db = read_session(pinned_to_primary(request))
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db(request: Request):
+    """
+    get_read_db for the async routes.
+    """
+    db = await async_read_session(pinned_to_primary(request))
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     Create a JWT access token
@@ -63,6 +101,10 @@ def verify_token(token: str) -> TokenData:
         headers={"WWW-Authenticate": "Bearer"},
     )
     
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached
+
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         user_id: str = payload.get("sub")
@@ -72,22 +114,44 @@ def verify_token(token: str) -> TokenData:
             raise credentials_exception
             
         token_data = TokenData(user_id=int(user_id), is_admin=is_admin)
+
+        # Only cache for as long as the token itself stays valid
+        expires_in = payload["exp"] - time.time() if payload.get("exp") else None
+        token_cache.set(token, token_data, ttl_seconds=expires_in)
         return token_data
         
     except JWTError:
         raise credentials_exception
 
 
-async def get_current_user(
+def load_user_snapshot(db: Session, user_id: int) -> Optional[UserSnapshot]:
+    """
+    Cached snapshot of the user, or None if the user doesn't exist.
+    """
+    snapshot = user_cache.get(user_id)
+    if snapshot is not None:
+        return snapshot
+
+    version = user_cache.version
+    user = db.query(User).filter(User.id == user_id).first()
+    if user is None:
+        return None
+
+    snapshot = UserSnapshot.from_user(user)
+    user_cache.set(user_id, snapshot, version=version)
+    return snapshot
+
+
+def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db)
-) -> User:
+) -> UserSnapshot:
     """
-    Get the current authenticated user
+    Get the current authenticated user (a cached snapshot, not a session-bound User row)
     """
     token_data = verify_token(token)
     
-    user = db.query(User).filter(User.id == token_data.user_id).first()
+    user = load_user_snapshot(db, token_data.user_id)
     
     if user is None:
         raise HTTPException(
@@ -98,9 +162,36 @@ async def get_current_user(
     return user
 
 
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+) -> UserSnapshot:
+    """
+    Get the current authenticated user through the async session (ASYNC_DB_ENABLED routes)
+    """
+    token_data = verify_token(token)
+
+    snapshot = user_cache.get(token_data.user_id)
+    if snapshot is not None:
+        return snapshot
+
+    version = user_cache.version
+    user = await db.get(User, token_data.user_id)
+
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found"
+        )
+
+    snapshot = UserSnapshot.from_user(user)
+    user_cache.set(user.id, snapshot, version=version)
+    return snapshot
+
+
 async def get_current_admin_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
+    current_user: UserSnapshot = Depends(get_current_user)
+) -> UserSnapshot:
     """
     Verify that the current user is an admin
     """
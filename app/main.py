@@ -7,14 +7,20 @@ from app.config import settings
 from app.routers import auth, events, registrations, colleges, users, notifications
 
 from fastapi import FastAPI
-from app.core.scheduler import start_scheduler
+from app.core.pool_metrics import render_pool_metrics
+from app.core.replicas import PRIMARY_PIN_COOKIE, PRIMARY_PIN_HEADER, primary_pin_value
+from app.core.scheduler import start_export_cleanup, start_scheduler
 from fastapi.middleware.cors import CORSMiddleware
 from app.routers import analytics
 
 
 
 
-start_scheduler()  # ✅ app startup
+# In-process scheduler runs in every web worker; disable it when `python -m app.worker` is deployed
+if settings.RUN_SCHEDULER_IN_WEB:
+    start_scheduler()  # ✅ app startup
+# Export jobs always run in the web process, so it cleans up after them either way
+start_export_cleanup()
 
 # Create FastAPI app
 app = FastAPI(
@@ -27,7 +33,7 @@ app = FastAPI(
 )
 
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 import logging
 
 @app.exception_handler(RequestValidationError)
@@ -67,14 +73,44 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Lets browser clients read the read-your-writes pin and send it back
+    expose_headers=[PRIMARY_PIN_HEADER, notifications.NEXT_CURSOR_HEADER],
 )
 
+if settings.replica_urls_list:
+    @app.middleware("http")
+    async def pin_writers_to_primary(request, call_next):
+        """
+        After a successful write, serve that client's reads from the primary for a few seconds.
+        The deadline travels with the client (cookie + header), so every worker honours it.
+        """
+        response = await call_next(request)
+        if request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400:
+            pin = primary_pin_value()
+            response.headers[PRIMARY_PIN_HEADER] = pin
+            # SameSite=None: the UI is served from another site than the API
+            response.set_cookie(
+                PRIMARY_PIN_COOKIE,
+                pin,
+                max_age=settings.READ_YOUR_WRITES_SECONDS,
+                httponly=True,
+                secure=True,
+                samesite="none",
+            )
+        return response
+
 # Mount static directory for uploads (Removed: Using Cloudinary)
 # os.makedirs("uploads", exist_ok=True)
 # app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
 
 
 # Include routers
+if settings.ASYNC_DB_ENABLED:
+    # Must come first: these async routes shadow the sync ones with the same paths
+    # (hidden from the schema, the documented contract is the sync routes')
+    from app.routers import async_routes
+    app.include_router(async_routes.router, prefix=settings.API_V1_PREFIX, include_in_schema=False)
+
 app.include_router(auth.router, prefix=settings.API_V1_PREFIX)
 app.include_router(users.router, prefix=settings.API_V1_PREFIX)
 app.include_router(events.router, prefix=settings.API_V1_PREFIX)
@@ -105,6 +141,14 @@ def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """
+    Prometheus metrics for this worker process (DB connection pools)
+    """
+    return PlainTextResponse(render_pool_metrics(), media_type="text/plain; version=0.0.4")
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, Text, DateTime, ForeignKey, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import bcrypt
@@ -42,6 +42,7 @@ class User(Base):
 
     # Relationships
     registrations = relationship("Registration", back_populates="user", cascade="all, delete-orphan")
+    waitlist_entries = relationship("WaitlistEntry", back_populates="user", cascade="all, delete-orphan")
     created_events = relationship("Event", back_populates="creator", cascade="all, delete-orphan")
     student_profile = relationship("Student", back_populates="user", uselist=False, cascade="all, delete-orphan")
 
@@ -90,28 +91,31 @@ class Student(Base):
 
 class Event(Base):
     __tablename__ = "events"
+    __table_args__ = (
+        # Interval lookups for schedule conflicts (end_time > x AND start_time < y, or end_time IS NULL)
+        Index("ix_events_end_time_start_time", "end_time", "start_time"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False, index=True)
     description = Column(Text, nullable=True)
-    category = Column(String, nullable=False)  # NEW
-    club = Column(String, nullable=True)
+    category = Column(String, nullable=False, index=True)  # NEW
+    club = Column(String, nullable=True, index=True)
     venue = Column(String(255), nullable=True)
     start_time = Column(DateTime, nullable=False, index=True)
     end_time = Column(DateTime, nullable=True)
     capacity = Column(Integer, nullable=True)
-    created_by = Column(Integer, ForeignKey("users.id"), nullable=False)
+    # Maintained on register/unregister; see app/services/registrations.py
+    registered_count = Column(Integer, nullable=False, default=0, server_default="0")
+    created_by = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     image_url = Column(String, nullable=True)
     # Relationships
     creator = relationship("User", back_populates="created_events")
     registrations = relationship("Registration", back_populates="event", cascade="all, delete-orphan")
+    waitlist_entries = relationship("WaitlistEntry", back_populates="event", cascade="all, delete-orphan")
     media = relationship("EventMedia", back_populates="event", cascade="all, delete-orphan")
 
-    @property
-    def registered_count(self) -> int:
-        return len(self.registrations)
-
     @property
     def is_full(self) -> bool:
         if self.capacity is None or self.capacity <= 0:
@@ -121,21 +125,48 @@ class Event(Base):
 
 class Registration(Base):
     __tablename__ = "registrations"
+    __table_args__ = (
+        UniqueConstraint("user_id", "event_id", name="uq_registrations_user_event"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
+    # user_id lookups use the leading column of uq_registrations_user_event
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    event_id = Column(Integer, ForeignKey("events.id"), nullable=False)
+    event_id = Column(Integer, ForeignKey("events.id"), nullable=False, index=True)
     registered_at = Column(DateTime, default=datetime.utcnow)
 
     # Relationships
     user = relationship("User", back_populates="registrations")
     event = relationship("Event", back_populates="registrations")
 
+class WaitlistEntry(Base):
+    __tablename__ = "waitlist_entries"
+    __table_args__ = (
+        UniqueConstraint("user_id", "event_id", name="uq_waitlist_entries_user_event"),
+        # FIFO scan per event: WHERE event_id = ? ORDER BY id
+        Index("ix_waitlist_entries_event_id_id", "event_id", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    event_id = Column(Integer, ForeignKey("events.id"), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    # Relationships
+    user = relationship("User", back_populates="waitlist_entries")
+    event = relationship("Event", back_populates="waitlist_entries")
+
 class Notification(Base):
     __tablename__ = "notifications"
+    __table_args__ = (
+        # Scheduler poll: WHERE delivered = false AND notify_at <= now
+        Index("ix_notifications_delivered_notify_at", "delivered", "notify_at"),
+        # Per-user feed and incremental sync, newest delivery first
+        Index("ix_notifications_user_id_delivered_at", "user_id", "delivered_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     title = Column(String, nullable=False)
     body = Column(String, nullable=False)
     notify_at = Column(DateTime, nullable=False)  # ✅ THIS IS MISSING
@@ -143,14 +174,49 @@ class Notification(Base):
 
     is_read = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # When the dispatcher delivered it; reminders are created long before they are delivered
+    delivered_at = Column(DateTime, nullable=True)
+    # Set when the row was created by a bulk fan-out to an event's registrants
+    broadcast_id = Column(Integer, ForeignKey("notification_broadcasts.id", ondelete="SET NULL"), nullable=True, index=True)
 
     user = relationship("User")
 
+
+class NotificationBroadcast(Base):
+    __tablename__ = "notification_broadcasts"
+
+    id = Column(Integer, primary_key=True, index=True)
+    event_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"), nullable=False, index=True)
+    created_by = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    title = Column(String, nullable=False)
+    body = Column(String, nullable=False)
+    recipient_count = Column(Integer, nullable=False, default=0, server_default="0")
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class EmailOutbox(Base):
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        # Outbox worker poll: WHERE status = 'pending' AND next_attempt_at <= now
+        Index("ix_email_outbox_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    to_email = Column(String, nullable=False)
+    subject = Column(String, nullable=False)
+    html_content = Column(Text, nullable=False)
+    status = Column(String, nullable=False, default="pending", server_default="pending")  # pending / sent / failed
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    next_attempt_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    sent_at = Column(DateTime, nullable=True)
+
 class EventMedia(Base):
     __tablename__ = "event_media"
 
     id = Column(Integer, primary_key=True, index=True)
-    event_id = Column(Integer, ForeignKey("events.id"), nullable=False)
+    event_id = Column(Integer, ForeignKey("events.id"), nullable=False, index=True)
     file_url = Column(String, nullable=False)
     file_type = Column(String, nullable=False)  # 'image', 'document', etc.
     created_at = Column(DateTime, default=datetime.utcnow)
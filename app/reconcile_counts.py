@@ -0,0 +1,22 @@
+from app.database import SessionLocal
+from app.services.registrations import reconcile_registered_counts
+
+
+def reconcile():
+    print("\n" + "="*50)
+    print("MAINTENANCE: Reconciling events.registered_count")
+    print("="*50)
+
+    db = SessionLocal()
+    try:
+        fixed = reconcile_registered_counts(db)
+        print(f"SUCCESS: {fixed} event counter(s) corrected.")
+    except Exception as e:
+        print(f"RECONCILE FAILED: {str(e)}")
+    finally:
+        db.close()
+
+    print("="*50 + "\n")
+
+if __name__ == "__main__":
+    reconcile()
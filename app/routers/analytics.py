@@ -1,8 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.database import get_db
 from app.models import Event, Registration, Student, User
-from app.dependencies import get_current_admin_user
+from app.dependencies import get_current_admin_user, get_read_db
 from sqlalchemy import func
 from datetime import date
 
@@ -12,7 +11,7 @@ router = APIRouter(prefix="/analytics", tags=["Analytics"])
 @router.get("/event/{event_id}")
 def event_analytics(
     event_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     admin=Depends(get_current_admin_user),
 ):
     event = db.query(Event).filter(Event.id == event_id).first()
@@ -40,7 +39,7 @@ def event_analytics(
 @router.get("/event/{event_id}/registrations-over-time")
 def registrations_over_time(
     event_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     admin=Depends(get_current_admin_user),
 ):
     results = (
@@ -62,7 +61,7 @@ def registrations_over_time(
 @router.get("/event/{event_id}/registrations-by-year")
 def registrations_by_year(
     event_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     admin=Depends(get_current_admin_user),
 ):
     results = (
@@ -0,0 +1,108 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from typing import List, Optional
+from datetime import datetime
+
+from app.database import get_async_db
+from app.dependencies import get_async_read_db, get_current_user_async
+from app.models import User, Event, Registration
+from app.schemas import EventResponse, MessageResponse, RegistrationWithEvent
+from app.routers.events import current_ist_time, filtered_events_query, order_upcoming_first
+from app.routers.notifications import NEXT_CURSOR_HEADER, not_modified, notification_page
+from app.routers.registrations import register_user_for_event
+from app.services.notifications import notifications_etag
+
+# Async versions of the hottest routes, served instead of the sync ones when ASYNC_DB_ENABLED is set
+# (included before the sync routers, so these paths match first). Responses are identical, and the
+# read-only ones go to the read replicas like their sync counterparts (get_async_read_db).
+router = APIRouter()
+
+
+@router.get("/events", response_model=list[EventResponse], tags=["Events"])
+async def list_events(
+    category: Optional[str] = Query(None),
+    club: Optional[str] = Query(None),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    stmt = order_upcoming_first(filtered_events_query(category, club), current_ist_time())
+    stmt = stmt.offset(skip).limit(limit)
+
+    return (await db.scalars(stmt)).all()
+
+
+# `:int` so that /events/feed and friends still fall through to the sync router
+@router.get("/events/{event_id:int}", response_model=EventResponse, tags=["Events"])
+async def get_event(
+    event_id: int,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    event = await db.get(Event, event_id)
+
+    if not event:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Event not found"
+        )
+
+    return event
+
+
+@router.get("/registrations/my-registrations", response_model=List[RegistrationWithEvent], tags=["Registrations"])
+async def get_my_registrations(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    result = await db.scalars(
+        select(Registration)
+        .options(joinedload(Registration.event))
+        .where(Registration.user_id == current_user.id)
+    )
+    return result.all()
+
+
+@router.post(
+    "/registrations/events/{event_id}/register",
+    response_model=MessageResponse,
+    status_code=status.HTTP_201_CREATED,
+    tags=["Registrations"]
+)
+async def register_for_event(
+    event_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    # Multi-step locking flow: run the shared sync implementation on this session's connection
+    new_registration = await db.run_sync(register_user_for_event, current_user, event_id)
+
+    return MessageResponse(
+        message="Successfully registered for event",
+        detail=f"Registration ID: {new_registration.id}"
+    )
+
+
+@router.get("/notifications/my", tags=["Notifications"])
+async def get_my_notifications(
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(100, ge=1, le=100),
+    since: Optional[datetime] = Query(None, description="Only notifications delivered at or after this time (UTC)"),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    etag = await db.run_sync(notifications_etag, current_user.id, cursor, limit, since)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    response.headers["ETag"] = etag
+
+    items, next_cursor = await db.run_sync(notification_page, current_user.id, cursor, limit, since)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+    return items
@@ -1,15 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query, File, UploadFile
 import shutil
 import os
-from datetime import datetime
+import json
+import base64
+from datetime import datetime, timedelta
 from app.config import settings
+from sqlalchemy import select, case, and_, or_
 from sqlalchemy.orm import Session
 from typing import List,Optional
 
 from app.database import get_db
 from app.models import User, Event, EventMedia
-from app.schemas import EventCreate, EventResponse, MessageResponse, EventUpdate, EventMediaResponse
-from app.dependencies import get_current_user, get_current_admin_user
+from app.schemas import EventCreate, EventResponse, EventPage, MessageResponse, EventUpdate, EventMediaResponse
+from app.dependencies import get_current_user, get_current_admin_user, get_read_db
 from app.utils.permissions import can_manage_event
 from fastapi import APIRouter, Depends, HTTPException, status, Query, File, UploadFile
 from fastapi.responses import RedirectResponse
@@ -81,65 +84,158 @@ def create_event(
     return new_event
 
 
-@router.get("", response_model=list[EventResponse])
-def list_events(
-    category: Optional[str] = Query(None),
-    club: Optional[str] = Query(None),
-    skip: int = 0,
-    limit: int = 20,
-    db: Session = Depends(get_db),
-):
-    query = db.query(Event)
-
-    if category:
-        query = query.filter(Event.category == category)
-
-    if club:
-        query = query.filter(Event.club == club)
-
-    from datetime import datetime, timedelta
-    
-    # 🕒 TIMEZONE FIX: 
+def current_ist_time() -> datetime:
+    # 🕒 TIMEZONE FIX:
     # The server (Render/Vercel) likely runs in UTC.
     # The database stores timestamps as "naive" (no timezone info), but users input them as local time (IST).
     # So a user inputting "2:00 PM" is stored as "14:00".
     # But "now" on the server is UTC (e.g. "08:30" when it is 14:00 in India).
     # So "14:00" > "08:30", making the event look like it's in the future.
     # To fix this, we need to compare the "stored time" with "server time converted to IST".
-    
+
     # Approx check for India (UTC+5:30)
     # If we add 5h 30m to server UTC time, we get approx IST time.
-    server_now = datetime.utcnow()
-    now_ist = server_now + timedelta(hours=5, minutes=30)
-    
-    # Use adjusted time for filtering
-    # 1. Upcoming events
-    upcoming_query = query.filter(Event.start_time >= now_ist).order_by(Event.start_time.asc())
-    
-    # 2. Past events
-    past_query = query.filter(Event.start_time < now_ist).order_by(Event.start_time.desc())
-
-    # Combine results
-    # Note: Pagination (skip/limit) logic becomes complex with split queries. 
-    # For now, we'll fetch them and slice in python or apply limit to the combined set if feasible.
-    # Given the user request for "Open on top", proper pagination requires combining counts.
-    # To keep it simple and functional for typical event volume:
-    
-    upcoming_events = upcoming_query.all()
-    past_events = past_query.all()
-    
-    all_events = upcoming_events + past_events
-    
-    # Manual pagination
-    start = skip
-    end = skip + limit
-    return all_events[start:end]
+    return datetime.utcnow() + timedelta(hours=5, minutes=30)
+
+
+# Listing buckets: upcoming events come first, then past events
+UPCOMING_BUCKET = 0
+PAST_BUCKET = 1
+
+
+def filtered_events_query(category: Optional[str], club: Optional[str]):
+    """
+    Base SELECT for the event listing with the optional category/club filters applied.
+    """
+    stmt = select(Event)
+
+    if category:
+        stmt = stmt.where(Event.category == category)
+
+    if club:
+        stmt = stmt.where(Event.club == club)
+
+    return stmt
+
+
+def order_upcoming_first(stmt, now_ist: datetime, bucket: Optional[int] = None):
+    """
+    Upcoming events (soonest first) followed by past events (most recent first).
+    Event.id (ascending in both buckets) breaks ties so pages are stable.
+    With bucket set, stmt is already limited to that bucket and only its keys are applied.
+    """
+    if bucket == UPCOMING_BUCKET:
+        return stmt.order_by(Event.start_time.asc(), Event.id.asc())
+    if bucket == PAST_BUCKET:
+        return stmt.order_by(Event.start_time.desc(), Event.id.asc())
+
+    is_upcoming = Event.start_time >= now_ist
+    bucket_key = case((is_upcoming, UPCOMING_BUCKET), else_=PAST_BUCKET)
+
+    return stmt.order_by(
+        bucket_key.asc(),
+        # Only upcoming rows get a value here, so past rows fall through to the next key
+        case((is_upcoming, Event.start_time)).asc(),
+        Event.start_time.desc(),
+        Event.id.asc(),
+    )
+
+
+@router.get("", response_model=list[EventResponse])
+def list_events(
+    category: Optional[str] = Query(None),
+    club: Optional[str] = Query(None),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1),
+    db: Session = Depends(get_read_db),
+):
+    # Single ordered query so LIMIT/OFFSET run in the database
+    stmt = order_upcoming_first(filtered_events_query(category, club), current_ist_time())
+    stmt = stmt.offset(skip).limit(limit)
+
+    return db.scalars(stmt).all()
+
+
+def encode_event_cursor(bucket: int, start_time: datetime, event_id: int) -> str:
+    raw = json.dumps({"b": bucket, "t": start_time.isoformat(), "i": event_id})
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_event_cursor(cursor: str) -> tuple[int, datetime, int]:
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        bucket = int(data["b"])
+        if bucket not in (UPCOMING_BUCKET, PAST_BUCKET):
+            raise ValueError("unknown bucket")
+        return bucket, datetime.fromisoformat(data["t"]), int(data["i"])
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+@router.get("/feed", response_model=EventPage)
+def list_events_feed(
+    category: Optional[str] = Query(None),
+    club: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_read_db),
+):
+    """
+    Keyset-paginated event listing (same order as GET /events).
+    Each page seeks past the (bucket, start_time, id) of the previous page's last event
+    instead of skipping rows, so deep pages cost the same as the first one.
+    """
+    base = filtered_events_query(category, club)
+    now_ist = current_ist_time()
+
+    after = decode_event_cursor(cursor) if cursor else None
+    # Fetch one extra row to know whether another page exists
+    want = limit + 1
+    page: list[tuple[int, Event]] = []
+
+    # 1. Upcoming events, soonest first
+    if after is None or after[0] == UPCOMING_BUCKET:
+        stmt = base.where(Event.start_time >= now_ist)
+        if after is not None:
+            _, after_time, after_id = after
+            stmt = stmt.where(or_(
+                Event.start_time > after_time,
+                and_(Event.start_time == after_time, Event.id > after_id)
+            ))
+        stmt = order_upcoming_first(stmt, now_ist, UPCOMING_BUCKET).limit(want)
+        page.extend((UPCOMING_BUCKET, e) for e in db.scalars(stmt))
+
+    # 2. Past events, most recent first (ties still by ascending id)
+    if len(page) < want:
+        stmt = base.where(Event.start_time < now_ist)
+        if after is not None and after[0] == PAST_BUCKET:
+            _, after_time, after_id = after
+            stmt = stmt.where(or_(
+                Event.start_time < after_time,
+                and_(Event.start_time == after_time, Event.id > after_id)
+            ))
+        stmt = order_upcoming_first(stmt, now_ist, PAST_BUCKET).limit(want - len(page))
+        page.extend((PAST_BUCKET, e) for e in db.scalars(stmt))
+
+    next_cursor = None
+    if len(page) > limit:
+        page = page[:limit]
+        bucket, last = page[-1]
+        next_cursor = encode_event_cursor(bucket, last.start_time, last.id)
+
+    return EventPage(
+        items=[e for _, e in page],
+        next_cursor=next_cursor
+    )
 
 
 @router.get("/{event_id}", response_model=EventResponse)
 def get_event(
     event_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -231,7 +327,7 @@ def update_event(
 
 
 @router.post("/{event_id}/cover-image", response_model=MessageResponse)
-async def upload_cover_image(
+def upload_cover_image(
     event_id: int,
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
@@ -278,7 +374,7 @@ async def upload_cover_image(
 
 
 @router.post("/{event_id}/upload", response_model=MessageResponse)
-async def upload_event_media(
+def upload_event_media(
     event_id: int,
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
@@ -523,7 +619,7 @@ class InsightsResponse(BaseModel):
 @router.get("/{event_id}/insights", response_model=InsightsResponse)
 def get_event_insights(
     event_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     # current_user: User = Depends(get_current_user) # Optional: open to public or restricted? Let's keep public for now or require auth if preferred.
 ):
     """
@@ -640,7 +736,7 @@ from app.dependencies import get_current_user, get_current_admin_user, get_optio
 
 @router.get("/insights/global", response_model=GlobalInsightsResponse)
 def get_global_insights(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: Optional[User] = Depends(get_optional_current_user) # Optional auth
 ):
     """
@@ -702,7 +798,7 @@ def get_global_insights(
         )
         def fill_percentage(e):
             if not e.capacity: return 0
-            return (len(e.registrations) / e.capacity)
+            return (e.registered_count / e.capacity)
 
         trending_db.sort(key=fill_percentage, reverse=True)
         trending_top_3 = trending_db[:3]
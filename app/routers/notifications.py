@@ -1,10 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import base64
+import json
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from sqlalchemy import and_, or_
 from sqlalchemy.orm import Session
+from typing import Optional
+from app.core.auth_cache import invalidate_user
 from app.database import get_db
-from app.dependencies import get_current_user
-from app.models import Notification, User
+from app.dependencies import get_current_user, get_read_db
+from app.models import Event, Notification, NotificationBroadcast, User
 from datetime import datetime
-from app.schemas import TokenRequest
+from app.schemas import (
+    BroadcastCreate,
+    BroadcastResponse,
+    MarkReadRequest,
+    MarkReadResponse,
+    NotificationPage,
+    TokenRequest,
+    UnreadCountResponse,
+)
+from app.services.notifications import (
+    broadcast_to_event,
+    count_unread_notifications,
+    delivered_notifications_query,
+    get_broadcast_delivered_count,
+    mark_notifications_read,
+    notifications_etag,
+)
+from app.utils.permissions import can_manage_event
 
 router = APIRouter(prefix="/notifications", tags=["Notifications"])
 
@@ -17,23 +39,154 @@ def save_fcm_token(
 ):
     print("🔥 RECEIVED TOKEN:", data.token)  # IMPORTANT
 
-    current_user.fcm_token = data.token
+    # current_user is a cached snapshot; update the actual row
+    user = db.query(User).filter(User.id == current_user.id).first()
+    user.fcm_token = data.token
     db.commit()
+    invalidate_user(user.id)
 
     return {"status": "token saved"}
 
 
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    return None
+
+
+def encode_notification_cursor(delivered_at: datetime, notification_id: int) -> str:
+    raw = json.dumps({"t": delivered_at.isoformat(), "i": notification_id})
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_notification_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return datetime.fromisoformat(data["t"]), int(data["i"])
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+# Next-page cursor of GET /notifications/my, which keeps its plain-list response body
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def notification_page(
+    db: Session,
+    user_id: int,
+    cursor: Optional[str],
+    limit: int,
+    since: Optional[datetime] = None,
+) -> tuple[list[Notification], Optional[str]]:
+    """
+    One page of delivered notifications, most recently delivered first, and the cursor of the next page.
+    Pages seek past the (delivered_at, id) of the previous page's last item.
+    """
+    stmt = delivered_notifications_query(user_id)
+    if since is not None:
+        stmt = stmt.where(Notification.delivered_at >= since)
+    if cursor:
+        after_time, after_id = decode_notification_cursor(cursor)
+        stmt = stmt.where(or_(
+            Notification.delivered_at < after_time,
+            and_(Notification.delivered_at == after_time, Notification.id < after_id)
+        ))
+
+    # Fetch one extra row to know whether another page exists
+    stmt = stmt.order_by(Notification.delivered_at.desc(), Notification.id.desc()).limit(limit + 1)
+    items = db.scalars(stmt).all()
+
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_notification_cursor(items[-1].delivered_at, items[-1].id)
+
+    return items, next_cursor
+
+
 @router.get("/my")
 def get_my_notifications(
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(100, ge=1, le=100),
+    since: Optional[datetime] = Query(None, description="Only notifications delivered at or after this time (UTC)"),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Delivered notifications, most recently delivered first, at most `limit` per call. When
+    there are more, the X-Next-Cursor header holds the ?cursor= of the next page (GET /feed
+    returns it in the body). Send the ETag back as If-None-Match to get a bodiless 304 when
+    nothing changed, and `since` to fetch only new deliveries.
+    """
+    etag = notifications_etag(db, current_user.id, cursor, limit, since)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    response.headers["ETag"] = etag
+
+    items, next_cursor = notification_page(db, current_user.id, cursor, limit, since)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+    return items
+
+
+@router.get("/feed", response_model=NotificationPage)
+def get_my_notifications_feed(
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    since: Optional[datetime] = Query(None, description="Only notifications delivered at or after this time (UTC)"),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Keyset-paginated notifications with the unread count, most recently delivered first.
+    Supports If-None-Match like GET /notifications/my.
+    """
+    etag = notifications_etag(db, current_user.id, cursor, limit, since)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    response.headers["ETag"] = etag
+
+    items, next_cursor = notification_page(db, current_user.id, cursor, limit, since)
+
+    return NotificationPage(
+        items=items,
+        next_cursor=next_cursor,
+        unread_count=count_unread_notifications(db, current_user.id)
+    )
+
+
+@router.get("/unread-count", response_model=UnreadCountResponse)
+def get_unread_count(
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+):
+    return UnreadCountResponse(unread_count=count_unread_notifications(db, current_user.id))
+
+
+@router.post("/read", response_model=MarkReadResponse)
+def mark_notifications_as_read(
+    data: MarkReadRequest,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    return (
-        db.query(Notification)
-        .filter(Notification.user_id == current_user.id)
-        .filter(Notification.delivered == True)
-        .order_by(Notification.created_at.desc())
-        .all()
+    """
+    Mark the given notification ids as read, or all of them when `ids` is omitted.
+    """
+    marked = mark_notifications_read(db, current_user.id, data.ids)
+
+    return MarkReadResponse(
+        marked_read=marked,
+        unread_count=count_unread_notifications(db, current_user.id)
     )
 
 
@@ -51,7 +204,8 @@ def test_sticky_notification(
         title="Test Sticky",
         body="This notification should be hard to clear.",
         notify_at=datetime.now(),
-        delivered=True
+        delivered=True,
+        delivered_at=datetime.utcnow()
     )
     db.add(notif)
     db.commit()
@@ -66,6 +220,73 @@ def test_sticky_notification(
     return {"status": "sent", "id": notif.id}
 
 
+def broadcast_response(db: Session, broadcast: NotificationBroadcast) -> BroadcastResponse:
+    delivered_count = get_broadcast_delivered_count(db, broadcast.id)
+
+    if delivered_count >= broadcast.recipient_count:
+        broadcast_status = "done"
+    elif delivered_count > 0:
+        broadcast_status = "sending"
+    else:
+        broadcast_status = "queued"
+
+    return BroadcastResponse(
+        id=broadcast.id,
+        event_id=broadcast.event_id,
+        title=broadcast.title,
+        body=broadcast.body,
+        recipient_count=broadcast.recipient_count,
+        delivered_count=delivered_count,
+        status=broadcast_status,
+        created_at=broadcast.created_at,
+    )
+
+
+@router.post(
+    "/events/{event_id}/broadcast",
+    response_model=BroadcastResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+def broadcast_event_notification(
+    event_id: int,
+    data: BroadcastCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Notify every registrant of an event (admin/creator only).
+    Returns immediately; pushes go out through the notification dispatcher.
+    """
+    event = db.query(Event).filter(Event.id == event_id).first()
+
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
+
+    if not can_manage_event(current_user, event):
+        raise HTTPException(status_code=403, detail="Not allowed")
+
+    broadcast = broadcast_to_event(db, event.id, data.title, data.body, current_user.id)
+    return broadcast_response(db, broadcast)
+
+
+@router.get("/broadcasts/{broadcast_id}", response_model=BroadcastResponse)
+def get_broadcast_status(
+    broadcast_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    broadcast = db.query(NotificationBroadcast).filter(NotificationBroadcast.id == broadcast_id).first()
+
+    if not broadcast:
+        raise HTTPException(status_code=404, detail="Broadcast not found")
+
+    event = db.query(Event).filter(Event.id == broadcast.event_id).first()
+    if not can_manage_event(current_user, event):
+        raise HTTPException(status_code=403, detail="Not allowed")
+
+    return broadcast_response(db, broadcast)
+
+
 @router.delete("", status_code=status.HTTP_204_NO_CONTENT)
 def clear_all_notifications(
     db: Session = Depends(get_db),
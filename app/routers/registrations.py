@@ -1,36 +1,99 @@
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session, joinedload
-from typing import List
-from io import BytesIO
-from openpyxl import Workbook
-from fastapi.responses import StreamingResponse
+from typing import List, Literal, Optional
+from fastapi.responses import StreamingResponse, JSONResponse, FileResponse
+from app.config import settings
 from app.database import get_db
-from app.models import User, Event, Registration
+from app.models import User, Event, Registration, WaitlistEntry
 from app.routers.events import get_event
-from app.schemas import RegistrationResponse, RegistrationWithUser, MessageResponse, RegistrationWithEvent
+from app.schemas import RegistrationResponse, RegistrationWithUser, MessageResponse, RegistrationWithEvent, WaitlistResponse, ExportJobResponse
 from app.dependencies import get_current_user, get_current_admin_user
 from app.utils.permissions import can_manage_event
 from datetime import datetime, timedelta
-from app.services.notifications import schedule_notification, send_notification
-from app.services.email import send_registration_confirmation
+from app.services.notifications import queue_notification
+from app.services.email_outbox import enqueue_registration_confirmation
+from app.services.registrations import adjust_registered_count, reserve_seat, has_schedule_conflict, is_duplicate_registration
+from app.services.exports import build_registrations_xlsx, iter_file, iter_registrations_csv, iter_registrations_ndjson
+from app.services.export_jobs import submit_export_job, get_export_job, artifact_path, JOB_STATUS_DONE
+from app.services.waitlist import get_waitlist_entry, get_waitlist_position, remove_from_waitlist, promote_from_waitlist
 
 # IST Offset
 IST_OFFSET = timedelta(hours=5, minutes=30)
 
 router = APIRouter(prefix="/registrations", tags=["Registrations"])
 
+EXPORT_MEDIA_TYPES = {
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
 
-@router.post(
-    "/events/{event_id}/register",
-    response_model=MessageResponse,
-    status_code=status.HTTP_201_CREATED
-)
-def register_for_event(
-    event_id: int,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
+
+def schedule_event_reminders(db: Session, user_id: int, event: Event):
+    """
+    Queue the "tomorrow" and "starting soon" reminders for a fresh registration.
+    Added to the caller's transaction, so they only exist if the registration commits.
+    """
+    now_ist = datetime.utcnow() + IST_OFFSET
+    event_start = event.start_time
+    one_day_before = event_start - timedelta(days=1)
+    three_hours_before = event_start - timedelta(hours=3)
+
+    # 1 Day Before (Sticky)
+    if one_day_before > now_ist:
+        queue_notification(
+            db,
+            user_id=user_id,
+            title=f"Upcoming Tomorrow: {event.title}",
+            body=f"Don't forget! {event.title} is tomorrow at {event.start_time.strftime('%I:%M %p')}",
+            notify_at=one_day_before - IST_OFFSET
+        )
+
+    # 3 Hours Before (Standard)
+    if three_hours_before > now_ist:
+        queue_notification(
+            db,
+            user_id=user_id,
+            title=f"Starting Soon: {event.title}",
+            body=f"Get ready! {event.title} starts soon at {event.start_time.strftime('%I:%M %p')}",
+            notify_at=three_hours_before - IST_OFFSET
+        )
+
+
+def queue_registration_confirmation(db: Session, user: User, event: Event, title: str, body: str):
+    """
+    Confirmation (push + email) and reminders for a new registration, direct or promoted from
+    the waitlist. Committed with the registration and delivered by the notification dispatcher /
+    email outbox, off the request path.
+    """
+    queue_notification(db, user_id=user.id, title=title, body=body)
+    enqueue_registration_confirmation(db, user, event)
+    schedule_event_reminders(db, user.id, event)
+
+
+def fill_freed_seat(db: Session, event: Event) -> Optional[User]:
+    """
+    Promote the head of the event's waitlist into a seat that was just given back, and queue
+    their confirmation. Runs in the caller's transaction; returns the promoted user, or None.
+    """
+    promoted_user = promote_from_waitlist(db, event)
+    if promoted_user:
+        queue_registration_confirmation(
+            db,
+            promoted_user,
+            event,
+            title="You're off the waitlist!",
+            body=f"A seat opened up and you are now registered for {event.title}."
+        )
+    return promoted_user
+
+
+def register_user_for_event(db: Session, current_user: User, event_id: int) -> Registration:
+    """
+    Registration flow shared by the sync route and the async one (via AsyncSession.run_sync).
+    Raises HTTPException on any rule violation; commits on success.
+    """
     # 1️⃣ Check if event exists
     event = db.query(Event).filter(Event.id == event_id).first()
     if not event:
@@ -59,29 +122,16 @@ def register_for_event(
             detail="You are already registered for this event"
         )
 
-    # 3️⃣ 🔥 CHECK OVERLAPPING EVENTS (THIS IS THE IMPORTANT PART)
     # 3️⃣ 🔥 CHECK OVERLAPPING EVENTS
-    overlapping_events = []
-    if event.end_time:
-        overlapping_events = (
-            db.query(Event)
-            .join(Registration, Registration.event_id == Event.id)
-            .filter(Registration.user_id == current_user.id)
-            .filter(
-                Event.start_time < event.end_time,
-                Event.end_time > event.start_time
-            )
-            .all()
-        )
-
-    if overlapping_events:
+    if has_schedule_conflict(db, current_user.id, event):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="You are already registered for another event during this time"
         )
 
-    # 4️⃣ Check capacity
-    if event.is_full:
+    # 4️⃣ Reserve a seat (guarded UPDATE, safe under concurrent registrations)
+    if not reserve_seat(db, event_id):
+        db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Event is full"
@@ -94,44 +144,46 @@ def register_for_event(
     )
 
     db.add(new_registration)
-    db.commit()
-    db.refresh(new_registration)
+    # Registering directly also takes the user off the waitlist
+    remove_from_waitlist(db, current_user.id, event_id)
+    # 5.5️⃣ Confirmation and reminders, committed together with the registration
+    # (current_user may be a cached snapshot; the email needs the full row)
+    queue_registration_confirmation(
+        db,
+        db.get(User, current_user.id),
+        event,
+        title="Registration Confirmed",
+        body=f"You have successfully registered for {event.title}!"
+    )
 
-    # 5.5️⃣ Send Immediate Confirmation
     try:
-        send_notification(
-            user=current_user,
-            title="Registration Confirmed",
-            body=f"You have successfully registered for {event.title}!"
+        db.commit()
+    except IntegrityError as e:
+        # The rollback also returns the seat
+        db.rollback()
+        if not is_duplicate_registration(e):
+            raise
+        # Lost a race with a duplicate request
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="You are already registered for this event"
         )
-    except Exception as e:
-        print(f"Error sending immediate notification: {e}")
-
-    # 5.6️⃣ Send Email Confirmation
-    background_tasks.add_task(send_registration_confirmation, current_user, event)
+    db.refresh(new_registration)
 
-    # 6️⃣ Schedule reminders
-    event_start = event.start_time
-    one_day_before = event_start - timedelta(days=1)
-    three_hours_before = event_start - timedelta(hours=3)
+    return new_registration
 
-    # 1 Day Before (Sticky)
-    if one_day_before > now_ist:
-        schedule_notification(
-            user_id=current_user.id,
-            title=f"Upcoming Tomorrow: {event.title}",
-            body=f"Don't forget! {event.title} is tomorrow at {event.start_time.strftime('%I:%M %p')}",
-            notify_at=one_day_before - IST_OFFSET
-        )
 
-    # 3 Hours Before (Standard)
-    if three_hours_before > now_ist:
-        schedule_notification(
-            user_id=current_user.id,
-            title=f"Starting Soon: {event.title}",
-            body=f"Get ready! {event.title} starts soon at {event.start_time.strftime('%I:%M %p')}",
-            notify_at=three_hours_before - IST_OFFSET
-        )
+@router.post(
+    "/events/{event_id}/register",
+    response_model=MessageResponse,
+    status_code=status.HTTP_201_CREATED
+)
+def register_for_event(
+    event_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    new_registration = register_user_for_event(db, current_user, event_id)
 
     return MessageResponse(
         message="Successfully registered for event",
@@ -178,6 +230,11 @@ def unregister_from_event(
         )
 
     db.delete(registration)
+    adjust_registered_count(db, event_id, -1)
+
+    # Hand the freed seat to the head of the waitlist in the same transaction
+    fill_freed_seat(db, event)
+
     db.commit()
     
     return MessageResponse(
@@ -186,6 +243,117 @@ def unregister_from_event(
     )
 
 
+@router.post(
+    "/events/{event_id}/waitlist",
+    response_model=WaitlistResponse,
+    status_code=status.HTTP_201_CREATED
+)
+def join_waitlist(
+    event_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Join the waitlist of a full event. Seats freed by unregistrations are handed out in FIFO order.
+    """
+    event = db.query(Event).filter(Event.id == event_id).first()
+    if not event:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Event not found"
+        )
+
+    now_ist = datetime.utcnow() + IST_OFFSET
+    if event.start_time < now_ist:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot join the waitlist for a past event"
+        )
+
+    existing_registration = db.query(Registration).filter(
+        Registration.user_id == current_user.id,
+        Registration.event_id == event_id
+    ).first()
+
+    if existing_registration:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="You are already registered for this event"
+        )
+
+    if not event.is_full:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Event still has free seats, register instead"
+        )
+
+    entry = WaitlistEntry(user_id=current_user.id, event_id=event_id)
+    db.add(entry)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="You are already on the waitlist for this event"
+        )
+    db.refresh(entry)
+
+    return WaitlistResponse(
+        event_id=event_id,
+        position=get_waitlist_position(db, entry),
+        joined_at=entry.created_at
+    )
+
+
+@router.get("/events/{event_id}/waitlist", response_model=WaitlistResponse)
+def get_my_waitlist_position(
+    event_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Current user's position on the event's waitlist
+    """
+    entry = get_waitlist_entry(db, current_user.id, event_id)
+    if not entry:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="You are not on the waitlist for this event"
+        )
+
+    return WaitlistResponse(
+        event_id=event_id,
+        position=get_waitlist_position(db, entry),
+        joined_at=entry.created_at
+    )
+
+
+@router.delete("/events/{event_id}/waitlist", response_model=MessageResponse)
+def leave_waitlist(
+    event_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Leave the event's waitlist
+    """
+    entry = get_waitlist_entry(db, current_user.id, event_id)
+    if not entry:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="You are not on the waitlist for this event"
+        )
+
+    db.delete(entry)
+    db.commit()
+
+    return MessageResponse(
+        message="Successfully left the waitlist",
+        detail=f"Event ID: {event_id}"
+    )
+
+
 @router.get("/events/{event_id}/registrations", response_model=List[RegistrationWithUser])
 def get_event_registrations(
     event_id: int,
@@ -233,6 +401,7 @@ def get_my_registrations(
 @router.get("/events/{event_id}/export")
 def export_event_registrations(
     event_id: int,
+    format: Literal["xlsx", "csv", "ndjson"] = Query("xlsx"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -251,71 +420,134 @@ def export_event_registrations(
             detail="Not authorized to export registrations"
         )
 
-    registrations = (
-        db.query(Registration)
-        .options(
-            joinedload(Registration.user)
-            .joinedload(User.student_profile)
+    # Big lists are exported in the background; the client polls the job instead
+    if event.registered_count > settings.EXPORT_ASYNC_THRESHOLD:
+        job = submit_export_job(event_id, format, current_user.id)
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content=export_job_response(job).model_dump(mode="json"),
         )
-        .filter(Registration.event_id == event_id)
-        .all()
-    )
 
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Registrations"
-
-    # Header
-    ws.append([
-        "S.No",
-        "USN",
-        "Full Name",
-        "Email",
-        "Year",
-        "Branch",
-        "Registered On"
-    ])
-
-    ws.freeze_panes = "A2"
-
-    from openpyxl.styles import Font
-    for cell in ws[1]:
-        cell.font = Font(bold=True)
-
-    ws.column_dimensions["A"].width = 8
-    ws.column_dimensions["B"].width = 18
-    ws.column_dimensions["C"].width = 25
-    ws.column_dimensions["D"].width = 30
-    ws.column_dimensions["E"].width = 10
-    ws.column_dimensions["F"].width = 20
-    ws.column_dimensions["G"].width = 22
-
-    for index, reg in enumerate(registrations, start=1):
-        user = reg.user
-        student = user.student_profile
-
-        ws.append([
-            index,
-            student.roll_number if student else "",
-            f"{user.first_name} {user.last_name}",
-            user.email,
-            student.year_of_study if student else "",
-            student.branch if student else "",
-            reg.registered_at.strftime("%Y-%m-%d %H:%M"),
-        ])
-
-    file_stream = BytesIO()
-    wb.save(file_stream)
-    file_stream.seek(0)
+    filename = f"event_{event_id}_registrations.{format}"
+
+    # CSV / NDJSON are written row by row straight from a server-side cursor
+    if format == "csv":
+        return StreamingResponse(
+            iter_registrations_csv(event_id),
+            media_type=EXPORT_MEDIA_TYPES["csv"],
+            headers={"Content-Disposition": f"attachment; filename={filename}"},
+        )
+
+    if format == "ndjson":
+        return StreamingResponse(
+            iter_registrations_ndjson(event_id),
+            media_type=EXPORT_MEDIA_TYPES["ndjson"],
+            headers={"Content-Disposition": f"attachment; filename={filename}"},
+        )
+
+    # Rows are streamed from the DB into a write-only workbook backed by a temp file
+    file_stream = build_registrations_xlsx(db, event_id)
 
     return StreamingResponse(
-        file_stream,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        iter_file(file_stream),
+        media_type=EXPORT_MEDIA_TYPES["xlsx"],
         headers={
-            "Content-Disposition": f"attachment; filename=event_{event_id}_registrations.xlsx"
+            "Content-Disposition": f"attachment; filename={filename}"
         },
     )
 
+def export_job_response(job: dict) -> ExportJobResponse:
+    download_url = None
+    if job["status"] == JOB_STATUS_DONE:
+        download_url = f"{settings.API_V1_PREFIX}/registrations/export-jobs/{job['job_id']}/download"
+
+    return ExportJobResponse(
+        job_id=job["job_id"],
+        event_id=job["event_id"],
+        format=job["format"],
+        status=job["status"],
+        created_at=job["created_at"],
+        finished_at=job["finished_at"],
+        error=job["error"],
+        download_url=download_url
+    )
+
+
+def get_export_job_or_404(job_id: str, current_user: User) -> dict:
+    if not (current_user.is_admin or current_user.is_super_admin):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to export registrations"
+        )
+
+    job = get_export_job(job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Export job not found"
+        )
+
+    return job
+
+
+@router.post(
+    "/events/{event_id}/export-jobs",
+    response_model=ExportJobResponse,
+    status_code=status.HTTP_202_ACCEPTED
+)
+def submit_export(
+    event_id: int,
+    format: Literal["xlsx", "csv", "ndjson"] = Query("xlsx"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Run a registrations export in the background (admin only). Poll the returned job for the download link.
+    """
+    event = db.query(Event).filter(Event.id == event_id).first()
+    if not event:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Event not found"
+        )
+
+    if not (current_user.is_admin or current_user.is_super_admin):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to export registrations"
+        )
+
+    return export_job_response(submit_export_job(event_id, format, current_user.id))
+
+
+@router.get("/export-jobs/{job_id}", response_model=ExportJobResponse)
+def get_export_status(
+    job_id: str,
+    current_user: User = Depends(get_current_user),
+):
+    return export_job_response(get_export_job_or_404(job_id, current_user))
+
+
+@router.get("/export-jobs/{job_id}/download")
+def download_export(
+    job_id: str,
+    current_user: User = Depends(get_current_user),
+):
+    job = get_export_job_or_404(job_id, current_user)
+
+    if job["status"] != JOB_STATUS_DONE:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Export is not ready (status: {job['status']})"
+        )
+
+    return FileResponse(
+        artifact_path(job),
+        media_type=EXPORT_MEDIA_TYPES[job["format"]],
+        filename=f"event_{job['event_id']}_registrations.{job['format']}"
+    )
+
+
 @router.get("/debug-time/{event_id}")
 def debug_event_timing(
     event_id: int,
@@ -1,12 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from typing import List
 
 from app.database import get_db
 from app.models import User
 from app.schemas import UserCreate, UserResponse, MessageResponse
+from app.core.auth_cache import invalidate_user
 from app.dependencies import get_current_user
-from app.models import User, Student
+from app.models import Event, User, Student
+from app.routers.registrations import fill_freed_seat
+from app.services.registrations import release_user_registrations
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
@@ -126,6 +130,7 @@ def activate_user(
     
     user.is_active = True
     db.commit()
+    invalidate_user(user.id)
     db.refresh(user)
     
     return user
@@ -157,6 +162,7 @@ def deactivate_user(
     
     user.is_active = False
     db.commit()
+    invalidate_user(user.id)
     db.refresh(user)
     
     return user
@@ -186,8 +192,19 @@ def delete_user(
             detail="You cannot delete your own account"
         )
     
+    # Registrations go with the user, so give their seats back first
+    event_ids = release_user_registrations(db, user.id)
     db.delete(user)
+    # Run the cascade now, so the user's own waitlist entries can't be promoted below
+    db.flush()
+
+    # Hand the freed seats to the waitlists, as unregistering does (events the user
+    # created are gone with them)
+    for event in db.scalars(select(Event).where(Event.id.in_(event_ids))).all():
+        fill_freed_seat(db, event)
+
     db.commit()
+    invalidate_user(user_id)
     
     return MessageResponse(
         message="User deleted successfully",
@@ -218,6 +235,7 @@ def activate_user(
 
     user.is_active = True
     db.commit()
+    invalidate_user(user.id)
 
     return {"message": "User activated successfully"}
 
@@ -227,6 +245,9 @@ def save_fcm_token(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    current_user.fcm_token = token
+    # current_user is a cached snapshot; update the actual row
+    user = db.query(User).filter(User.id == current_user.id).first()
+    user.fcm_token = token
     db.commit()
+    invalidate_user(user.id)
     return {"message": "FCM token saved"}
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, EmailStr, Field, ConfigDict
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 
 # ============================================
@@ -58,6 +58,54 @@ class TokenData(BaseModel):
 
 class TokenRequest(BaseModel):
     token: str
+
+
+class BroadcastCreate(BaseModel):
+    title: str = Field(..., min_length=1, max_length=255)
+    body: str = Field(..., min_length=1)
+
+
+class BroadcastResponse(BaseModel):
+    id: int
+    event_id: int
+    title: str
+    body: str
+    recipient_count: int
+    delivered_count: int
+    status: str  # queued / sending / done
+    created_at: datetime
+
+
+class NotificationResponse(BaseModel):
+    id: int
+    title: str
+    body: str
+    is_read: bool
+    created_at: datetime
+    delivered_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class NotificationPage(BaseModel):
+    items: List[NotificationResponse]
+    next_cursor: Optional[str] = None  # Pass back as ?cursor= to fetch the next (older) page
+    unread_count: int
+
+
+class UnreadCountResponse(BaseModel):
+    unread_count: int
+
+
+class MarkReadRequest(BaseModel):
+    ids: Optional[List[int]] = None  # Omit to mark every notification as read
+
+
+class MarkReadResponse(BaseModel):
+    marked_read: int
+    unread_count: int
+
+
 # ============================================
 # STUDENT SCHEMAS
 # ============================================
@@ -141,6 +189,11 @@ class EventResponse(EventBase):
 
     model_config = ConfigDict(from_attributes=True)
 
+
+class EventPage(BaseModel):
+    items: List[EventResponse]
+    next_cursor: Optional[str] = None  # Pass back as ?cursor= to fetch the next page
+
 class EventMediaResponse(BaseModel):
     id: int
     event_id: int
@@ -185,6 +238,23 @@ class RegistrationWithEvent(RegistrationResponse):
     model_config = ConfigDict(from_attributes=True)
 
 
+class WaitlistResponse(BaseModel):
+    event_id: int
+    position: int
+    joined_at: datetime
+
+
+class ExportJobResponse(BaseModel):
+    job_id: str
+    event_id: int
+    format: str
+    status: str  # pending / running / done / failed
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+    download_url: Optional[str] = None
+
+
 # ============================================
 # RESPONSE MESSAGES
 # ============================================
@@ -0,0 +1,33 @@
+from typing import Callable, Sequence
+from sqlalchemy.orm import Session
+from app.database import SessionLocal
+
+
+def drain_in_batches(
+    claim: Callable[[Session, int], Sequence],
+    process: Callable[[Session, Sequence], None],
+    batch_size: int,
+) -> int:
+    """
+    Claim-process-commit loop of the background senders (notification dispatcher, email outbox).
+
+    `claim(db, batch_size)` locks the next due rows with FOR UPDATE SKIP LOCKED, so several
+    workers can drain the same queue side by side without picking the same rows.
+    `process(db, batch)` sends them and updates the rows. Every batch is committed on its own:
+    that releases its row locks, and a crash only replays the batch in flight.
+    Returns the number of rows claimed.
+    """
+    db = SessionLocal()
+    try:
+        claimed = 0
+        while True:
+            batch = claim(db, batch_size)
+            if batch:
+                process(db, batch)
+            db.commit()
+            claimed += len(batch)
+
+            if len(batch) < batch_size:
+                return claimed
+    finally:
+        db.close()
@@ -1,8 +1,115 @@
+"""
+Brevo (transactional email) client.
+
+Emails are only sent from the email outbox worker (app/services/email_outbox.py), a scheduler
+thread, never from a request handler, the async ones included. So the pooled client is a sync
+requests.Session shared by the worker's threads rather than an async one: nothing on an event
+loop waits for Brevo.
+"""
+import threading
 from fastapi import BackgroundTasks
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from app.config import settings
 from app.models import User, Event
 
+# One pooled session for every Brevo call, so TLS connections are reused across emails
+_session = None
+_session_lock = threading.Lock()
+# Caps in-flight Brevo requests; extra senders wait here instead of opening more connections
+_send_slots = threading.BoundedSemaphore(settings.BREVO_MAX_CONCURRENCY)
+
+
+def get_brevo_session() -> requests.Session:
+    global _session
+
+    with _session_lock:
+        if _session is None:
+            # POST isn't idempotent: only retry when Brevo certainly didn't accept the email.
+            # That is a failed connect (nothing sent) or a 429/503 (rejected before processing).
+            # After a read timeout, a dropped connection or a 500/502/504 it may have gone out
+            # already, so the error goes back to the caller instead of an immediate resend.
+            retry = Retry(
+                total=settings.BREVO_MAX_RETRIES,
+                connect=settings.BREVO_MAX_RETRIES,
+                read=0,
+                other=0,
+                status=settings.BREVO_MAX_RETRIES,
+                status_forcelist=(429, 503),
+                allowed_methods=frozenset({"POST"}),
+                backoff_factor=settings.BREVO_BACKOFF_SECONDS,
+                respect_retry_after_header=True,
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=settings.BREVO_MAX_CONCURRENCY,
+                max_retries=retry,
+            )
+
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update({
+                "accept": "application/json",
+                "content-type": "application/json",
+            })
+            _session = session
+
+        return _session
+
+
+def brevo_sender() -> dict:
+    return {
+        "name": "Event Manager",
+        "email": settings.SMTP_FROM_EMAIL if settings.SMTP_FROM_EMAIL else "no-reply@eventmanager.com"
+    }
+
+
+def brevo_recipient(to_email: str) -> dict:
+    return {
+        "email": to_email,
+        "name": to_email.split("@")[0]
+    }
+
+
+def post_to_brevo(payload: dict) -> requests.Response:
+    headers = {
+        "api-key": settings.BREVO_API_KEY,
+    }
+
+    with _send_slots:
+        return get_brevo_session().post(
+            settings.BREVO_API_URL,
+            json=payload,
+            headers=headers,
+            timeout=(settings.BREVO_CONNECT_TIMEOUT_SECONDS, settings.BREVO_READ_TIMEOUT_SECONDS),
+        )
+
+
+def send_email_batch(emails: list[dict]) -> requests.Response:
+    """
+    Send several emails in one Brevo request using messageVersions.
+    Each email is a dict with to_email, subject and html_content; Brevo accepts or rejects the request as a whole.
+    """
+    first = emails[0]
+    payload = {
+        "sender": brevo_sender(),
+        "subject": first["subject"],
+        "htmlContent": first["html_content"],
+        "messageVersions": [
+            {
+                "to": [brevo_recipient(e["to_email"])],
+                "subject": e["subject"],
+                "htmlContent": e["html_content"],
+            }
+            for e in emails
+        ],
+    }
+    return post_to_brevo(payload)
+
+
 def send_email(to_email: str, subject: str, html_content: str):
     """
     Sends an email using Brevo (Sendinblue) API v3.
@@ -12,31 +119,15 @@ def send_email(to_email: str, subject: str, html_content: str):
         print("❌ Brevo API key not found. Email not sent.")
         return
 
-    url = "https://api.brevo.com/v3/smtp/email"
-    
-    headers = {
-        "accept": "application/json",
-        "api-key": settings.BREVO_API_KEY,
-        "content-type": "application/json"
-    }
-    
     payload = {
-        "sender": {
-            "name": "Event Manager",
-            "email": settings.SMTP_FROM_EMAIL if settings.SMTP_FROM_EMAIL else "no-reply@eventmanager.com"
-        },
-        "to": [
-            {
-                "email": to_email,
-                "name": to_email.split("@")[0]
-            }
-        ],
+        "sender": brevo_sender(),
+        "to": [brevo_recipient(to_email)],
         "subject": subject,
         "htmlContent": html_content
     }
 
     try:
-        response = requests.post(url, json=payload, headers=headers)
+        response = post_to_brevo(payload)
         if response.status_code == 201:
             print(f"✅ Email sent successfully to {to_email} (via Brevo)")
         else:
@@ -44,7 +135,7 @@ def send_email(to_email: str, subject: str, html_content: str):
     except Exception as e:
         print(f"❌ Exception sending email via Brevo: {e}")
 
-def send_registration_confirmation(user: User, event: Event):
+def registration_confirmation_email(user: User, event: Event) -> tuple[str, str]:
     subject = f"Registration Confirmed: {event.title}"
     
     body = f"""
@@ -67,6 +158,11 @@ def send_registration_confirmation(user: User, event: Event):
         </body>
     </html>
     """
-    
+
+    return subject, body
+
+def send_registration_confirmation(user: User, event: Event):
+    subject, body = registration_confirmation_email(user, event)
+
     # Send using Brevo
     send_email(user.email, subject, body)
@@ -0,0 +1,132 @@
+from datetime import datetime, timedelta
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models import EmailOutbox, Event, User
+from app.services.batches import drain_in_batches
+from app.services.email import registration_confirmation_email, send_email_batch
+
+EMAIL_STATUS_PENDING = "pending"
+EMAIL_STATUS_SENT = "sent"
+EMAIL_STATUS_FAILED = "failed"
+
+# Brevo accepts at most this many messageVersions per request
+BREVO_MAX_BATCH_SIZE = 1000
+
+
+def enqueue_email(db: Session, to_email: str, subject: str, html_content: str) -> EmailOutbox:
+    """
+    Add an email to the outbox. Not committed here: it is sent only if the caller's transaction commits.
+    """
+    email = EmailOutbox(
+        to_email=to_email,
+        subject=subject,
+        html_content=html_content,
+        status=EMAIL_STATUS_PENDING,
+        next_attempt_at=datetime.utcnow()
+    )
+    db.add(email)
+    return email
+
+
+def enqueue_registration_confirmation(db: Session, user: User, event: Event) -> EmailOutbox | None:
+    # Email is optional at signup; those users only get the push/web notification
+    if not user.email:
+        return None
+
+    subject, body = registration_confirmation_email(user, event)
+    return enqueue_email(db, user.email, subject, body)
+
+
+def claim_pending_emails(db: Session, now: datetime, batch_size: int) -> list[EmailOutbox]:
+    """
+    Lock a batch of due emails (the claim step of drain_in_batches).
+    """
+    return db.scalars(
+        select(EmailOutbox)
+        .where(
+            EmailOutbox.status == EMAIL_STATUS_PENDING,
+            EmailOutbox.next_attempt_at <= now
+        )
+        .order_by(EmailOutbox.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    ).all()
+
+
+def _record_result(email: EmailOutbox, error: str | None, now: datetime):
+    email.attempts += 1
+
+    if error is None:
+        email.status = EMAIL_STATUS_SENT
+        email.sent_at = now
+        email.last_error = None
+        return
+
+    email.last_error = error
+    if email.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+        email.status = EMAIL_STATUS_FAILED
+        print(f"❌ Giving up on email {email.id} to {email.to_email}: {error}")
+    else:
+        delay = settings.EMAIL_OUTBOX_RETRY_SECONDS * 2 ** (email.attempts - 1)
+        email.next_attempt_at = now + timedelta(seconds=delay)
+
+
+def _send(emails: list[EmailOutbox]) -> str | None:
+    """
+    Send emails in one Brevo request. Returns None on success, otherwise the error.
+    """
+    try:
+        response = send_email_batch([
+            {"to_email": e.to_email, "subject": e.subject, "html_content": e.html_content}
+            for e in emails
+        ])
+    except Exception as e:
+        return str(e)
+
+    if response.status_code == 201:
+        return None
+    return f"{response.status_code} - {response.text}"
+
+
+def deliver_batch(emails: list[EmailOutbox]):
+    now = datetime.utcnow()
+
+    if not settings.BREVO_API_KEY:
+        for email in emails:
+            _record_result(email, "Brevo API key not configured", now)
+        return
+
+    error = _send(emails)
+
+    # Brevo rejects the whole request if one message is invalid (e.g. a bad address);
+    # send the batch one by one so the rest still go out and only the bad one is retried
+    if error is not None and len(emails) > 1 and error.startswith("400"):
+        for email in emails:
+            _record_result(email, _send([email]), now)
+        return
+
+    for email in emails:
+        _record_result(email, error, now)
+
+
+def deliver_outbox_emails():
+    """
+    Drain due outbox emails with drain_in_batches, one Brevo request per batch.
+    """
+    now = datetime.utcnow()
+    sent = 0
+
+    def deliver(db: Session, batch: list[EmailOutbox]):
+        nonlocal sent
+        deliver_batch(batch)
+        sent += sum(1 for e in batch if e.status == EMAIL_STATUS_SENT)
+
+    drain_in_batches(
+        lambda db, size: claim_pending_emails(db, now, size),
+        deliver,
+        min(settings.EMAIL_OUTBOX_BATCH_SIZE, BREVO_MAX_BATCH_SIZE),
+    )
+
+    if sent:
+        print(f"✅ Sent {sent} outbox email(s) via Brevo")
@@ -0,0 +1,207 @@
+import json
+import os
+import re
+import socket
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Optional
+from app.config import settings
+from app.database import SessionLocal
+from app.services.exports import (
+    iter_registrations_csv,
+    iter_registrations_ndjson,
+    write_registrations_xlsx,
+)
+
+# Job state lives next to the artifact on disk, so every worker process on the host sees it
+JOB_STATUS_PENDING = "pending"
+JOB_STATUS_RUNNING = "running"
+JOB_STATUS_DONE = "done"
+JOB_STATUS_FAILED = "failed"
+
+_JOB_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+_executor = ThreadPoolExecutor(max_workers=settings.EXPORT_WORKERS, thread_name_prefix="export")
+
+# Random per-process token recorded on each job: tells a restarted process that reuses a pid
+# (common in containers) apart from the one that started the job
+_owner_tokens: dict[int, str] = {}
+
+
+def _current_owner() -> dict:
+    pid = os.getpid()
+    return {
+        "host": socket.gethostname(),
+        "pid": pid,
+        "token": _owner_tokens.setdefault(pid, uuid.uuid4().hex),
+    }
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _is_orphaned(job: dict) -> bool:
+    """
+    True for a pending/running job whose process is gone (restart, crash): nothing will finish it.
+    Jobs owned by another host are left alone, their process can't be checked from here.
+    """
+    if job["status"] not in (JOB_STATUS_PENDING, JOB_STATUS_RUNNING):
+        return False
+
+    owner = job.get("owner")
+    if owner is None:
+        # Written before jobs recorded their owner, i.e. before the last restart
+        return True
+    if owner["host"] != socket.gethostname():
+        return False
+
+    current = _current_owner()
+    if owner["pid"] == current["pid"]:
+        return owner["token"] != current["token"]
+    return not _pid_alive(owner["pid"])
+
+
+def _meta_path(job_id: str) -> str:
+    return os.path.join(settings.EXPORT_DIR, f"{job_id}.json")
+
+
+def artifact_path(job: dict) -> str:
+    return os.path.join(settings.EXPORT_DIR, f"{job['job_id']}.{job['format']}")
+
+
+def _save_job(job: dict):
+    # Write-then-rename so pollers never read a half-written file
+    path = _meta_path(job["job_id"])
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(job, f)
+    os.replace(tmp_path, path)
+
+
+def get_export_job(job_id: str) -> Optional[dict]:
+    if not _JOB_ID_PATTERN.match(job_id):
+        return None
+
+    try:
+        with open(_meta_path(job_id)) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def _write_artifact(job: dict, path: str):
+    event_id = job["event_id"]
+
+    if job["format"] == "xlsx":
+        db = SessionLocal()
+        try:
+            with open(path, "wb") as f:
+                write_registrations_xlsx(db, event_id, f)
+        finally:
+            db.close()
+        return
+
+    chunks = iter_registrations_csv(event_id) if job["format"] == "csv" else iter_registrations_ndjson(event_id)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        for chunk in chunks:
+            f.write(chunk)
+
+
+def _run_export_job(job: dict):
+    job["status"] = JOB_STATUS_RUNNING
+    _save_job(job)
+
+    path = artifact_path(job)
+    tmp_path = f"{path}.part"
+    try:
+        _write_artifact(job, tmp_path)
+        os.replace(tmp_path, path)
+        job["status"] = JOB_STATUS_DONE
+    except Exception as e:
+        print(f"Export job {job['job_id']} failed: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        job["status"] = JOB_STATUS_FAILED
+        job["error"] = str(e)
+
+    job["finished_at"] = datetime.utcnow().isoformat()
+    _save_job(job)
+
+
+def submit_export_job(event_id: int, format: str, requested_by: int) -> dict:
+    """
+    Queue an export on the worker pool and return its job record.
+    """
+    os.makedirs(settings.EXPORT_DIR, exist_ok=True)
+    cleanup_expired_exports()
+
+    job = {
+        "job_id": uuid.uuid4().hex,
+        "event_id": event_id,
+        "format": format,
+        "requested_by": requested_by,
+        "owner": _current_owner(),
+        "status": JOB_STATUS_PENDING,
+        "created_at": datetime.utcnow().isoformat(),
+        "finished_at": None,
+        "error": None,
+    }
+    _save_job(job)
+    _executor.submit(_run_export_job, dict(job))
+
+    return job
+
+
+def cleanup_expired_exports():
+    """
+    Housekeeping for EXPORT_DIR, run by the scheduler in every web process and on each submit:
+    - jobs orphaned by a restart are marked failed (their executor is gone)
+    - finished jobs (metadata and artifact) are deleted EXPORT_JOB_TTL_MINUTES after finishing
+    Jobs still pending or running are never deleted.
+    """
+    if not os.path.isdir(settings.EXPORT_DIR):
+        return
+
+    now = datetime.utcnow()
+    cutoff = now - timedelta(minutes=settings.EXPORT_JOB_TTL_MINUTES)
+
+    for name in os.listdir(settings.EXPORT_DIR):
+        job_id, ext = os.path.splitext(name)
+        if ext != ".json":
+            continue
+
+        job = get_export_job(job_id)
+        if job is None:
+            continue
+
+        if _is_orphaned(job):
+            print(f"Export job {job_id} was interrupted by a restart, marking it failed")
+            job["status"] = JOB_STATUS_FAILED
+            job["error"] = "Interrupted by a server restart, please export again"
+            job["finished_at"] = now.isoformat()
+            _save_job(job)
+            _remove(f"{artifact_path(job)}.part")
+            continue
+
+        if job["status"] not in (JOB_STATUS_DONE, JOB_STATUS_FAILED):
+            continue
+        if datetime.fromisoformat(job["finished_at"]) >= cutoff:
+            continue
+
+        _remove(artifact_path(job))
+        _remove(_meta_path(job_id))
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,189 @@
+import csv
+import io
+import json
+import tempfile
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.database import SessionLocal
+from app.models import Registration, Student, User
+
+# Rows fetched per round-trip while exporting
+EXPORT_BATCH_SIZE = 1000
+# Chunk size used when streaming a finished file to the client
+STREAM_CHUNK_SIZE = 64 * 1024
+
+EXPORT_HEADERS = [
+    "S.No",
+    "USN",
+    "Full Name",
+    "Email",
+    "Year",
+    "Branch",
+    "Registered On"
+]
+
+XLSX_COLUMN_WIDTHS = {"A": 8, "B": 18, "C": 25, "D": 30, "E": 10, "F": 20, "G": 22}
+
+
+def registration_export_query(event_id: int):
+    """
+    Flat User/Student projection of an event's registrations (no ORM objects are built).
+    """
+    return (
+        select(
+            Registration.registered_at,
+            User.first_name,
+            User.last_name,
+            User.email,
+            Student.roll_number,
+            Student.year_of_study,
+            Student.branch,
+        )
+        .join(User, User.id == Registration.user_id)
+        .outerjoin(Student, Student.user_id == User.id)
+        .where(Registration.event_id == event_id)
+        .order_by(Registration.id)
+    )
+
+
+def iter_export_records(db: Session, event_id: int):
+    """
+    Iterate (serial number, row) pairs, fetching EXPORT_BATCH_SIZE rows per round-trip.
+    yield_per also makes psycopg2 use a server-side cursor.
+    """
+    result = db.execute(
+        registration_export_query(event_id).execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    return enumerate(result, start=1)
+
+
+def format_export_row(index: int, row) -> list:
+    """
+    Spreadsheet-style row in EXPORT_HEADERS order (blanks for missing student data).
+    """
+    return [
+        index,
+        row.roll_number or "",
+        f"{row.first_name} {row.last_name}",
+        row.email,
+        row.year_of_study or "",
+        row.branch or "",
+        row.registered_at.strftime("%Y-%m-%d %H:%M"),
+    ]
+
+
+def format_export_record(index: int, row) -> dict:
+    """
+    JSON-friendly record (nulls for missing student data).
+    """
+    return {
+        "s_no": index,
+        "usn": row.roll_number,
+        "full_name": f"{row.first_name} {row.last_name}",
+        "email": row.email,
+        "year": row.year_of_study,
+        "branch": row.branch,
+        "registered_on": row.registered_at.isoformat(),
+    }
+
+
+def write_registrations_xlsx(db: Session, event_id: int, file_obj):
+    """
+    Write the export as XLSX using openpyxl's write-only mode, which keeps
+    memory flat regardless of the number of registrations.
+    """
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Registrations")
+
+    ws.freeze_panes = "A2"
+    for column, width in XLSX_COLUMN_WIDTHS.items():
+        ws.column_dimensions[column].width = width
+
+    header = []
+    for title in EXPORT_HEADERS:
+        cell = WriteOnlyCell(ws, value=title)
+        cell.font = Font(bold=True)
+        header.append(cell)
+    ws.append(header)
+
+    for index, row in iter_export_records(db, event_id):
+        ws.append(format_export_row(index, row))
+
+    wb.save(file_obj)
+
+
+def build_registrations_xlsx(db: Session, event_id: int):
+    """
+    Build the XLSX in an anonymous temp file (on disk, not in memory) and return it rewound.
+    """
+    file_obj = tempfile.TemporaryFile()
+    try:
+        write_registrations_xlsx(db, event_id, file_obj)
+    except Exception:
+        file_obj.close()
+        raise
+    file_obj.seek(0)
+    return file_obj
+
+
+def iter_registrations_csv(event_id: int):
+    """
+    Stream the export as CSV straight off the DB cursor.
+    Opens its own session because the request's session may already be closed while the body is sent.
+    """
+    db = SessionLocal()
+    try:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_HEADERS)
+
+        for index, row in iter_export_records(db, event_id):
+            writer.writerow(format_export_row(index, row))
+            if buffer.tell() >= STREAM_CHUNK_SIZE:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+
+        yield buffer.getvalue()
+    finally:
+        db.close()
+
+
+def iter_registrations_ndjson(event_id: int):
+    """
+    Stream the export as newline-delimited JSON, one registration per line.
+    """
+    db = SessionLocal()
+    try:
+        chunk = []
+        size = 0
+        for index, row in iter_export_records(db, event_id):
+            line = json.dumps(format_export_record(index, row)) + "\n"
+            chunk.append(line)
+            size += len(line)
+            if size >= STREAM_CHUNK_SIZE:
+                yield "".join(chunk)
+                chunk = []
+                size = 0
+
+        if chunk:
+            yield "".join(chunk)
+    finally:
+        db.close()
+
+
+def iter_file(file_obj, chunk_size: int = STREAM_CHUNK_SIZE):
+    """
+    Stream a file in chunks and close it when done.
+    """
+    try:
+        while True:
+            chunk = file_obj.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        file_obj.close()
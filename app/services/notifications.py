@@ -1,13 +1,18 @@
+import hashlib
 from datetime import datetime, timedelta
 from apscheduler.schedulers.background import BackgroundScheduler
-from app.core.firebase import send_fcm
+from app.core.firebase import FCM_MAX_BATCH_SIZE, send_fcm
+from app.core.reminders import announce_reminders
 from app.database import SessionLocal
 from app.models import Notification
 from datetime import datetime
+from sqlalchemy import Boolean, DateTime, Integer, String, func, insert, literal, select, update
 from sqlalchemy.orm import Session
+from app.config import settings
 from app.database import SessionLocal
-from app.models import Notification
-from app.services.push import send_push_notification  # adjust if needed
+from app.models import Notification, NotificationBroadcast, Registration, User
+from app.services.batches import drain_in_batches
+from app.services.push import send_push_notifications  # adjust if needed
 # scheduler = BackgroundScheduler()
 # scheduler.start()
 
@@ -19,13 +24,38 @@ def store_web_notification(user_id: int, title: str, body: str, delivered: bool
             title=title,
             body=body,
             notify_at=datetime.utcnow(),
-            delivered=delivered
+            delivered=delivered,
+            delivered_at=datetime.utcnow() if delivered else None
         )
         db.add(notif)
         db.commit()
     finally:
         db.close()
 
+def queue_notification(
+    db: Session,
+    user_id: int,
+    title: str,
+    body: str,
+    notify_at: datetime | None = None
+) -> Notification:
+    """
+    Add a notification to the caller's transaction; the dispatcher delivers it (web list + push)
+    at notify_at, or right after commit when notify_at is omitted. Nothing is sent on rollback.
+    """
+    notify_at = notify_at or datetime.utcnow()
+
+    notif = Notification(
+        user_id=user_id,
+        title=title,
+        body=body,
+        notify_at=notify_at,
+        delivered=False
+    )
+    db.add(notif)
+    announce_reminders(db, [notify_at])
+    return notif
+
 def schedule_notification(
     user_id: int,
     title: str,
@@ -34,16 +64,8 @@ def schedule_notification(
 ):
     db: Session = SessionLocal()
     try:
-        notif = Notification(
-            user_id=user_id,
-            title=title,
-            body=body,
-            notify_at=notify_at,
-            delivered=False
-        )
-        db.add(notif)
+        queue_notification(db, user_id, title, body, notify_at)
         db.commit()
-        # Optionally trigger scheduler if needed, but for now we rely on DB polling or external scheduler
     finally:
         db.close()
 def send_notification(user, title, body):
@@ -62,40 +84,189 @@ def send_notification(user, title, body):
         except Exception as e:
             print(f"Failed to send Push Notification: {e}")
 
-def send_due_notifications():
-    db: Session = SessionLocal()
+def broadcast_to_event(db: Session, event_id: int, title: str, body: str, created_by: int) -> NotificationBroadcast:
+    """
+    Queue one notification per registrant of the event with a single INSERT ... SELECT.
+    Delivery (web list + batched pushes) is left to the dispatcher, which is woken on commit.
+    """
+    now = datetime.utcnow()
+
+    broadcast = NotificationBroadcast(
+        event_id=event_id,
+        created_by=created_by,
+        title=title,
+        body=body,
+        created_at=now
+    )
+    db.add(broadcast)
+    db.flush()
+
+    result = db.execute(
+        insert(Notification).from_select(
+            ["user_id", "title", "body", "notify_at", "delivered", "is_read", "created_at", "broadcast_id"],
+            select(
+                Registration.user_id,
+                literal(title, String),
+                literal(body, String),
+                literal(now, DateTime),
+                literal(False, Boolean),
+                literal(False, Boolean),
+                literal(now, DateTime),
+                literal(broadcast.id, Integer),
+            ).where(Registration.event_id == event_id)
+        )
+    )
+    broadcast.recipient_count = result.rowcount
+
+    announce_reminders(db, [now])
+    db.commit()
+    db.refresh(broadcast)
+
+    return broadcast
+
+
+def get_broadcast_delivered_count(db: Session, broadcast_id: int) -> int:
+    return db.scalar(
+        select(func.count(Notification.id)).where(
+            Notification.broadcast_id == broadcast_id,
+            Notification.delivered == True
+        )
+    )
+
+
+def delivered_notifications_query(user_id: int):
+    return select(Notification).where(
+        Notification.user_id == user_id,
+        Notification.delivered == True
+    )
+
+
+def count_unread_notifications(db: Session, user_id: int) -> int:
+    return db.scalar(
+        select(func.count(Notification.id)).where(
+            Notification.user_id == user_id,
+            Notification.delivered == True,
+            Notification.is_read == False
+        )
+    )
+
+
+def notifications_etag(db: Session, user_id: int, *params) -> str:
+    """
+    ETag for a user's notification list, from one aggregate over their rows (no rows are loaded).
+    Changes on a new delivery (count / latest delivered_at), a deletion (count / max id) or a read (unread count).
+    """
+    state = db.execute(
+        select(
+            func.count(Notification.id),
+            func.max(Notification.id),
+            func.max(Notification.delivered_at),
+            func.count(Notification.id).filter(Notification.is_read == False),
+        ).where(
+            Notification.user_id == user_id,
+            Notification.delivered == True
+        )
+    ).one()
+
+    digest = hashlib.sha1(repr((user_id, tuple(state), params)).encode("utf-8")).hexdigest()
+    return f'W/"{digest}"'
+
+
+def mark_notifications_read(db: Session, user_id: int, ids: list[int] | None = None) -> int:
+    """
+    Mark the given notifications (or all of them) as read in one UPDATE. Returns the number changed.
+    """
+    stmt = (
+        update(Notification)
+        .where(
+            Notification.user_id == user_id,
+            Notification.delivered == True,
+            Notification.is_read == False
+        )
+        .values(is_read=True)
+        .execution_options(synchronize_session=False)
+    )
+    if ids is not None:
+        stmt = stmt.where(Notification.id.in_(ids))
+
+    result = db.execute(stmt)
+    db.commit()
+    return result.rowcount
+
+
+def claim_due_notifications(db: Session, now: datetime, batch_size: int):
+    """
+    Lock the next batch of due, undelivered notifications together with the recipient's FCM token
+    (the claim step of drain_in_batches).
+    """
+    return db.execute(
+        select(Notification, User.fcm_token)
+        .join(User, User.id == Notification.user_id)
+        .where(
+            Notification.notify_at <= now,
+            Notification.delivered == False
+        )
+        .order_by(Notification.notify_at, Notification.id)
+        .limit(batch_size)
+        .with_for_update(of=Notification, skip_locked=True)
+    ).all()
+
+
+def deliver_pushes(db: Session, pushes: list[dict]):
+    """
+    Send a batch of pushes in as few FCM calls as possible and forget tokens FCM reports as unregistered.
+    """
     try:
-        # 🕒 TIMEZONE FIX:
-        # We store notify_at in UTC (converted before saving).
-        # So we compare against server UTC time.
-        server_now = datetime.utcnow()
-
-        notifications = (
-            db.query(Notification)            .filter(
-                Notification.notify_at <= server_now,
-                Notification.delivered == False
-            )
-            .all()
+        results = send_push_notifications(pushes)
+    except Exception as e:
+        print(f"Error sending push notification batch: {e}")
+        return
+
+    failed = [r for r in results if not r["success"]]
+    if failed:
+        print(f"{len(failed)}/{len(results)} push notifications failed")
+
+    stale_tokens = {r["token"] for r in failed if r["unregistered"]}
+    if stale_tokens:
+        db.execute(
+            update(User)
+            .where(User.fcm_token.in_(stale_tokens))
+            .values(fcm_token=None)
+            .execution_options(synchronize_session=False)
         )
 
-        for n in notifications:
-            if n.user and n.user.fcm_token:
+
+def deliver_notification_batch(db: Session, batch):
+    delivered_at = datetime.utcnow()
+
+    pushes = []
+    for n, fcm_token in batch:
+        if fcm_token:
+            pushes.append({
+                "token": fcm_token,
+                "title": n.title,
+                "body": n.body,
                 # 1-day reminder is sticky (cannot be swiped away)
-                is_sticky = n.title.startswith("Upcoming Tomorrow")
+                "sticky": n.title.startswith("Upcoming Tomorrow"),
+            })
 
-                try:
-                    send_push_notification(
-                        fcm_token=n.user.fcm_token,
-                        title=n.title,
-                        body=n.body,
-                        sticky=is_sticky
-                    )
-                except Exception as e:
-                    print(f"Error sending push notification to user {n.user_id}: {e}")
+        n.delivered = True
+        n.delivered_at = delivered_at
 
-            n.delivered = True
+    if pushes:
+        deliver_pushes(db, pushes)
 
-        db.commit()
 
-    finally:
-        db.close()
+def send_due_notifications():
+    # 🕒 TIMEZONE FIX:
+    # We store notify_at in UTC (converted before saving).
+    # So we compare against server UTC time.
+    server_now = datetime.utcnow()
+    # One claimed batch goes out in a single send_each call
+    batch_size = min(settings.NOTIFICATION_BATCH_SIZE, FCM_MAX_BATCH_SIZE)
+
+    drain_in_batches(
+        lambda db, size: claim_due_notifications(db, server_now, size),
+        deliver_notification_batch,
+        batch_size,
+    )
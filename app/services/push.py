@@ -1,4 +1,4 @@
-from app.core.firebase import send_fcm
+from app.core.firebase import send_fcm, send_fcm_batch
 
 def send_push_notification(fcm_token: str, title: str, body: str, sticky: bool = False):
     send_fcm(
@@ -7,3 +7,10 @@ def send_push_notification(fcm_token: str, title: str, body: str, sticky: bool =
         body=body,
         sticky=sticky
     )
+
+
+def send_push_notifications(messages: list[dict]) -> list[dict]:
+    """
+    Batch variant: messages are dicts with token/title/body/sticky; returns per-token results.
+    """
+    return send_fcm_batch(messages)
@@ -0,0 +1,125 @@
+from datetime import timedelta
+from sqlalchemy import exists, func, or_, select, union_all, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models import Event, Registration
+
+
+def adjust_registered_count(db: Session, event_id: int, delta: int):
+    """
+    Bump events.registered_count in the caller's transaction.
+    The UPDATE is relative, so concurrent requests don't overwrite each other.
+    """
+    db.execute(
+        update(Event)
+        .where(Event.id == event_id)
+        .values(registered_count=Event.registered_count + delta)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def reserve_seat(db: Session, event_id: int) -> bool:
+    """
+    Atomically take one seat on the event in the caller's transaction.
+    The capacity check and the increment are a single guarded UPDATE, so concurrent
+    registrations can't both see the last free seat. Returns False if the event is full.
+    """
+    result = db.execute(
+        update(Event)
+        .where(
+            Event.id == event_id,
+            or_(
+                Event.capacity.is_(None),
+                Event.capacity <= 0,
+                Event.registered_count < Event.capacity,
+            )
+        )
+        .values(registered_count=Event.registered_count + 1)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+
+def schedule_conflict_query(user_id: int, event: Event):
+    """
+    SELECT of one event the user is registered for that overlaps this one (see has_schedule_conflict).
+    """
+    open_ended = timedelta(minutes=settings.OPEN_ENDED_EVENT_MINUTES)
+    start = event.start_time
+    end = event.end_time or start + open_ended
+
+    registered = exists().where(
+        Registration.event_id == Event.id,
+        Registration.user_id == user_id
+    )
+    overlapping = select(Event.id).where(
+        Event.id != event.id,
+        Event.start_time < end,
+        registered
+    )
+
+    # Two range scans on events(end_time, start_time): the cost grows with the number of
+    # events still running at `start`, not with the user's registration history
+    return union_all(
+        overlapping.where(Event.end_time > start),
+        overlapping.where(Event.end_time.is_(None), Event.start_time > start - open_ended),
+    ).limit(1)
+
+
+def has_schedule_conflict(db: Session, user_id: int, event: Event) -> bool:
+    """
+    True if the user is registered for another event whose time overlaps this one.
+    Events without an end_time are treated as lasting OPEN_ENDED_EVENT_MINUTES.
+    """
+    return db.scalar(schedule_conflict_query(user_id, event)) is not None
+
+
+def is_duplicate_registration(error: IntegrityError) -> bool:
+    """
+    True if the error is the (user_id, event_id) unique violation on registrations,
+    as opposed to any other constraint failing in the same transaction.
+    """
+    message = str(error.orig)
+    # Postgres names the constraint, SQLite lists its columns
+    return (
+        "uq_registrations_user_event" in message
+        or "registrations.user_id, registrations.event_id" in message
+    )
+
+
+def release_user_registrations(db: Session, user_id: int) -> list[int]:
+    """
+    Decrement the counters of every event the user is registered for and return their ids.
+    Call before deleting the user (registrations are removed by cascade).
+    """
+    event_ids = db.scalars(
+        select(Registration.event_id).where(Registration.user_id == user_id)
+    ).all()
+
+    for event_id in event_ids:
+        adjust_registered_count(db, event_id, -1)
+
+    return event_ids
+
+
+def reconcile_registered_counts(db: Session) -> int:
+    """
+    Recompute events.registered_count from the registrations table.
+    Returns the number of events whose counter was wrong.
+    """
+    actual = (
+        select(func.count(Registration.id))
+        .where(Registration.event_id == Event.id)
+        .scalar_subquery()
+    )
+
+    result = db.execute(
+        update(Event)
+        .where(Event.registered_count != actual)
+        .values(registered_count=actual)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+    return result.rowcount
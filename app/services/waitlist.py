@@ -0,0 +1,81 @@
+from typing import Optional
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+from app.models import Event, Registration, User, WaitlistEntry
+from app.services.notifications import queue_notification
+from app.services.registrations import has_schedule_conflict, reserve_seat
+
+
+def get_waitlist_entry(db: Session, user_id: int, event_id: int) -> Optional[WaitlistEntry]:
+    return db.scalars(
+        select(WaitlistEntry).where(
+            WaitlistEntry.user_id == user_id,
+            WaitlistEntry.event_id == event_id
+        )
+    ).first()
+
+
+def get_waitlist_position(db: Session, entry: WaitlistEntry) -> int:
+    """
+    1-based position in the event's queue (entries are served in id order).
+    """
+    return db.scalar(
+        select(func.count(WaitlistEntry.id)).where(
+            WaitlistEntry.event_id == entry.event_id,
+            WaitlistEntry.id <= entry.id
+        )
+    )
+
+
+def remove_from_waitlist(db: Session, user_id: int, event_id: int):
+    """
+    Drop the user's entry (if any) in the caller's transaction.
+    """
+    db.execute(
+        delete(WaitlistEntry).where(
+            WaitlistEntry.user_id == user_id,
+            WaitlistEntry.event_id == event_id
+        )
+    )
+
+
+def promote_from_waitlist(db: Session, event: Event) -> Optional[User]:
+    """
+    Move the head of the event's waitlist into a registration, if a seat is free.
+    Entries whose user has since registered for an overlapping event are dropped (and told so),
+    as the direct registration path would reject them.
+    Runs in the caller's transaction; returns the promoted user, or None.
+    """
+    while True:
+        entry = db.scalars(
+            select(WaitlistEntry)
+            .where(WaitlistEntry.event_id == event.id)
+            .order_by(WaitlistEntry.id.asc())
+            .limit(1)
+            # Concurrent promotions pick different heads instead of blocking on the same row
+            .with_for_update(skip_locked=True)
+        ).first()
+
+        if entry is None:
+            return None
+
+        if has_schedule_conflict(db, entry.user_id, event):
+            queue_notification(
+                db,
+                user_id=entry.user_id,
+                title="Removed from waitlist",
+                body=f"A seat opened up for {event.title}, but it overlaps another event you are registered for."
+            )
+            db.delete(entry)
+            # autoflush is off: flush so the next query doesn't return this entry again
+            db.flush()
+            continue
+
+        if not reserve_seat(db, event.id):
+            return None
+
+        db.add(Registration(user_id=entry.user_id, event_id=event.id))
+        user = entry.user
+        db.delete(entry)
+
+        return user
@@ -0,0 +1,24 @@
+from apscheduler.schedulers.blocking import BlockingScheduler
+from app.config import settings
+from app.core.scheduler import add_jobs
+
+
+def run_worker():
+    """
+    Background worker: runs the scheduled jobs (notification and email delivery) outside the web process.
+    Start with `python -m app.worker` and set RUN_SCHEDULER_IN_WEB=false on the web service.
+    """
+    worker = BlockingScheduler()
+    add_jobs(worker)
+
+    print("Notification worker started")
+    if settings.RUN_SCHEDULER_IN_WEB:
+        print("Warning: RUN_SCHEDULER_IN_WEB is enabled, web workers are running the same jobs")
+
+    try:
+        worker.start()
+    except (KeyboardInterrupt, SystemExit):
+        print("Notification worker stopped")
+
+if __name__ == "__main__":
+    run_worker()
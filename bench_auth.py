@@ -0,0 +1,93 @@
+"""
+Concurrency benchmark for authenticated requests.
+
+Fires an authenticated GET (default: /api/notifications/unread-count) at a running server with increasing numbers of concurrent
+clients and prints throughput and latency for each level. With the auth lookup
+off the event loop, req/s should keep rising with concurrency (up to the
+threadpool / DB pool size) instead of staying flat.
+
+Usage:
+    uvicorn app.main:app --workers 1
+    python bench_auth.py --email admin@example.com --password secret
+    python bench_auth.py --token <jwt> --concurrency 1 4 16 32 --requests 400
+"""
+import argparse
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+
+def login(base_url: str, email: str, password: str) -> str:
+    response = requests.post(
+        f"{base_url}/api/auth/login",
+        data={"username": email, "password": password},
+        timeout=10,
+    )
+    if response.status_code != 200:
+        print(f"Login failed: {response.status_code} - {response.text}")
+        sys.exit(1)
+    return response.json()["access_token"]
+
+
+def run_level(url: str, token: str, concurrency: int, total: int) -> dict:
+    local = threading.local()
+    headers = {"Authorization": f"Bearer {token}"}
+
+    def one_request(_):
+        # One keep-alive session per client thread
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+        start = time.perf_counter()
+        response = local.session.get(url, headers=headers, timeout=30)
+        return time.perf_counter() - start, response.status_code
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one_request, range(total)))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(r[0] for r in results)
+    return {
+        "concurrency": concurrency,
+        "rps": total / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "errors": sum(1 for _, code in results if code != 200),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Authenticated throughput vs. concurrency")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--path", default="/api/notifications/unread-count", help="Authenticated GET endpoint to hit")
+    parser.add_argument("--token", help="JWT to use (otherwise log in with --email/--password)")
+    parser.add_argument("--email")
+    parser.add_argument("--password")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument("--requests", type=int, default=500, help="Requests per concurrency level")
+    args = parser.parse_args()
+
+    token = args.token
+    if not token:
+        if not (args.email and args.password):
+            parser.error("pass --token or --email and --password")
+        token = login(args.base_url, args.email, args.password)
+
+    url = f"{args.base_url}{args.path}"
+
+    # Warm up connections and the DB pool
+    run_level(url, token, max(args.concurrency), min(args.requests, 50))
+
+    print(f"--- Authenticated throughput (GET {args.path}) ---")
+    print(f"{'clients':>8} {'req/s':>10} {'p50 ms':>10} {'p99 ms':>10} {'errors':>8}")
+    for concurrency in args.concurrency:
+        r = run_level(url, token, concurrency, args.requests)
+        print(f"{r['concurrency']:>8} {r['rps']:>10.1f} {r['p50_ms']:>10.1f} {r['p99_ms']:>10.1f} {r['errors']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import os
+import tempfile
+from datetime import datetime, timedelta
+from itertools import count
+
+# Settings are read at import time: point the app at a throwaway SQLite database first
+_db_dir = tempfile.mkdtemp(prefix="event-manager-tests-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_db_dir, 'test.db')}")
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("RUN_SCHEDULER_IN_WEB", "false")
+os.environ.setdefault("EXPORT_DIR", os.path.join(_db_dir, "exports"))
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.database import Base, SessionLocal, engine
+from app.dependencies import create_access_token
+from app.main import app
+from app.models import Event, Student, User
+
+_ids = count(1)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def create_tables():
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+@pytest.fixture
+def make_user(db):
+    def _make_user(is_admin: bool = False, with_email: bool = True) -> User:
+        n = next(_ids)
+        user = User(
+            username=f"user{n}",
+            email=f"user{n}@example.com" if with_email else None,
+            first_name=f"User{n}",
+            is_admin=is_admin,
+            is_active=True,
+        )
+        user.set_password("secret1")
+        db.add(user)
+        db.commit()
+        db.add(Student(user_id=user.id, roll_number=f"R{n}", branch="CSE", year_of_study=2))
+        db.commit()
+        return user
+
+    return _make_user
+
+
+@pytest.fixture
+def make_event(db, make_user):
+    def _make_event(start_in: timedelta = timedelta(days=5), duration: timedelta | None = timedelta(hours=2),
+                    capacity: int | None = 10, created_by: User | None = None, start_at: datetime | None = None,
+                    **fields) -> Event:
+        start = start_at or datetime.utcnow() + start_in
+        event = Event(
+            title=fields.pop("title", "Event"),
+            description="",
+            category=fields.pop("category", "Tech"),
+            venue="Hall",
+            start_time=start,
+            end_time=start + duration if duration else None,
+            capacity=capacity,
+            created_by=(created_by or make_user(is_admin=True)).id,
+            **fields,
+        )
+        db.add(event)
+        db.commit()
+        return event
+
+    return _make_event
+
+
+@pytest.fixture
+def auth_headers():
+    def _auth_headers(user: User) -> dict:
+        token = create_access_token({"sub": str(user.id), "is_admin": user.is_admin})
+        return {"Authorization": f"Bearer {token}"}
+
+    return _auth_headers
@@ -0,0 +1,71 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event as sa_event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app import database
+from app.config import settings
+from app.core import replicas
+from app.database import async_database_url
+from app.models import Registration
+from app.routers import async_routes
+
+
+@pytest.fixture
+def async_client(monkeypatch):
+    """
+    Client for the ASYNC_DB_ENABLED routes on an aiosqlite engine derived from DATABASE_URL,
+    as app/database.py builds it when the flag is set. Yields the client and the list of
+    statements the async engine ran.
+    """
+    async_engine = create_async_engine(async_database_url(settings.DATABASE_URL))
+    session_factory = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    monkeypatch.setattr(database, "AsyncSessionLocal", session_factory)
+    monkeypatch.setattr(replicas, "AsyncSessionLocal", session_factory)
+
+    statements = []
+    sa_event.listen(
+        async_engine.sync_engine, "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement)
+    )
+
+    app = FastAPI()
+    app.include_router(async_routes.router, prefix=settings.API_V1_PREFIX)
+    with TestClient(app) as client:
+        yield client, statements
+    asyncio.run(async_engine.dispose())
+
+
+def test_async_url_uses_asyncio_drivers():
+    assert async_database_url("sqlite:///app.db") == "sqlite+aiosqlite:///app.db"
+    assert async_database_url("postgres://u:p@host/db") == "postgresql+asyncpg://u:p@host/db"
+
+
+def test_async_routes_use_the_async_session(async_client, db, make_user, make_event, auth_headers):
+    client, statements = async_client
+    event = make_event(start_in=timedelta(days=7), category="Async", title="Async Event")
+    user = make_user()
+
+    response = client.get("/api/events", params={"category": "Async"})
+    assert response.status_code == 200
+    assert [e["id"] for e in response.json()] == [event.id]
+    assert statements
+
+    statements.clear()
+    response = client.get(f"/api/events/{event.id}", headers=auth_headers(user))
+    assert response.status_code == 200
+    assert response.json()["title"] == event.title
+    assert statements
+
+    statements.clear()
+    response = client.post(f"/api/registrations/events/{event.id}/register", headers=auth_headers(user))
+    assert response.status_code == 201
+    assert any(s.lstrip().upper().startswith("INSERT INTO REGISTRATIONS") for s in statements)
+
+    assert db.query(Registration).filter_by(user_id=user.id, event_id=event.id).count() == 1
+    db.refresh(event)
+    assert event.registered_count == 1
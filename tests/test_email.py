@@ -0,0 +1,145 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from app.config import settings
+from app.services import email
+
+
+class FakeBrevo:
+    """
+    Local HTTP stub for the Brevo API: answers each POST with the next scripted response.
+    A response is a status code, or ("sleep", seconds) to stall past the client's read timeout.
+    """
+
+    def __init__(self):
+        self.script = []
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.delay = 0
+        self.lock = threading.Lock()
+
+        brevo = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                self.rfile.read(int(self.headers["Content-Length"]))
+                with brevo.lock:
+                    brevo.requests += 1
+                    brevo.in_flight += 1
+                    brevo.max_in_flight = max(brevo.max_in_flight, brevo.in_flight)
+                    step = brevo.script.pop(0) if brevo.script else 201
+                try:
+                    if isinstance(step, tuple):
+                        time.sleep(step[1])
+                        step = 201
+                    time.sleep(brevo.delay)
+                    body = b'{"messageId": "1"}'
+                    self.send_response(step)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(body)))
+                    if step == 429:
+                        self.send_header("Retry-After", "0")
+                    self.end_headers()
+                    self.wfile.write(body)
+                except OSError:
+                    # The client gave up (read timeout)
+                    pass
+                finally:
+                    with brevo.lock:
+                        brevo.in_flight -= 1
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/v3/smtp/email"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def brevo(monkeypatch):
+    fake = FakeBrevo()
+    monkeypatch.setattr(settings, "BREVO_API_URL", fake.url)
+    monkeypatch.setattr(settings, "BREVO_API_KEY", "test-key")
+    monkeypatch.setattr(settings, "BREVO_BACKOFF_SECONDS", 0)
+    monkeypatch.setattr(settings, "BREVO_READ_TIMEOUT_SECONDS", 0.5)
+    # The session is built once from the settings; rebuild it for the stub
+    monkeypatch.setattr(email, "_session", None)
+    yield fake
+    email._session = None
+    fake.close()
+
+
+def send():
+    return email.send_email_batch([{"to_email": "a@example.com", "subject": "s", "html_content": "b"}])
+
+
+@pytest.mark.parametrize("status", [429, 503])
+def test_retries_when_brevo_did_not_accept(brevo, status):
+    brevo.script = [status, status]
+
+    response = send()
+
+    assert response.status_code == 201
+    assert brevo.requests == 3
+
+
+@pytest.mark.parametrize("status", [500, 502, 504])
+def test_no_retry_when_email_may_have_been_accepted(brevo, status):
+    brevo.script = [status]
+
+    response = send()
+
+    assert response.status_code == status
+    assert brevo.requests == 1
+
+
+def test_gives_up_after_max_retries(brevo, monkeypatch):
+    monkeypatch.setattr(settings, "BREVO_MAX_RETRIES", 2)
+    brevo.script = [503] * 5
+
+    response = send()
+
+    assert response.status_code == 503
+    assert brevo.requests == 3
+
+
+def test_read_timeout_is_not_retried(brevo):
+    brevo.script = [("sleep", 1.5)]
+
+    # read=0: urllib3 gives up on the first read error, which requests reports as a ConnectionError
+    with pytest.raises(requests.exceptions.ConnectionError, match="Read timed out"):
+        send()
+    assert brevo.requests == 1
+
+
+def test_connection_refused_raises(brevo, monkeypatch):
+    port = brevo.server.server_port
+    brevo.close()
+    monkeypatch.setattr(settings, "BREVO_API_URL", f"http://127.0.0.1:{port}/v3/smtp/email")
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        send()
+
+
+def test_concurrency_is_capped(brevo, monkeypatch):
+    monkeypatch.setattr(email, "_send_slots", threading.BoundedSemaphore(2))
+    brevo.delay = 0.2
+
+    threads = [threading.Thread(target=send) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert brevo.requests == 6
+    assert brevo.max_in_flight == 2
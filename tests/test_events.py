@@ -0,0 +1,48 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+
+def page_with_offsets(client, category: str, limit: int) -> list[int]:
+    ids, skip = [], 0
+    while True:
+        response = client.get("/api/events", params={"category": category, "skip": skip, "limit": limit})
+        assert response.status_code == 200
+        batch = [e["id"] for e in response.json()]
+        ids += batch
+        if len(batch) < limit:
+            return ids
+        skip += limit
+
+
+def page_with_cursor(client, category: str, limit: int) -> list[int]:
+    ids, cursor = [], None
+    while True:
+        params = {"category": category, "limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/events/feed", params=params)
+        assert response.status_code == 200
+        body = response.json()
+        ids += [e["id"] for e in body["items"]]
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return ids
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 50])
+def test_feed_pages_like_event_listing(client, make_event, limit):
+    category = f"Feed-{limit}"
+    # Same moment shared by several events in both buckets, so the id tiebreak decides
+    now_ist = datetime.utcnow() + timedelta(hours=5, minutes=30)
+    upcoming = (now_ist + timedelta(days=2)).replace(microsecond=0)
+    past = (now_ist - timedelta(days=2)).replace(microsecond=0)
+    for start_at in (upcoming, past, upcoming, past, past, upcoming + timedelta(hours=1),
+                     past - timedelta(hours=1), upcoming):
+        make_event(start_at=start_at, category=category)
+
+    listing = page_with_offsets(client, category, limit)
+    feed = page_with_cursor(client, category, limit)
+
+    assert len(listing) == 8
+    assert feed == listing
@@ -0,0 +1,107 @@
+import os
+import socket
+import subprocess
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.config import settings
+from app.services import export_jobs
+from app.services.export_jobs import (
+    JOB_STATUS_DONE,
+    JOB_STATUS_FAILED,
+    JOB_STATUS_RUNNING,
+    artifact_path,
+    cleanup_expired_exports,
+    get_export_job,
+)
+
+
+@pytest.fixture
+def export_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "EXPORT_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "EXPORT_JOB_TTL_MINUTES", 60)
+    return tmp_path
+
+
+def dead_pid() -> int:
+    process = subprocess.Popen(["true"])
+    process.wait()
+    return process.pid
+
+
+def save_job(job_id: str, status: str, owner: dict | None, age: timedelta = timedelta(0)) -> dict:
+    at = (datetime.utcnow() - age).isoformat()
+    job = {
+        "job_id": job_id.ljust(32, "0"),
+        "event_id": 1,
+        "format": "csv",
+        "requested_by": 1,
+        "owner": owner,
+        "status": status,
+        "created_at": at,
+        "finished_at": at if status in (JOB_STATUS_DONE, JOB_STATUS_FAILED) else None,
+        "error": None,
+    }
+    export_jobs._save_job(job)
+    with open(artifact_path(job), "w") as f:
+        f.write("data")
+    return job
+
+
+def test_orphaned_jobs_are_marked_failed(export_dir):
+    this_host = socket.gethostname()
+    crashed = save_job("a1", JOB_STATUS_RUNNING, {"host": this_host, "pid": dead_pid(), "token": "x"})
+    # Same pid as this process but started by an earlier process (pid reused after a restart)
+    reused_pid = save_job("a2", JOB_STATUS_RUNNING, {"host": this_host, "pid": os.getpid(), "token": "old"})
+    partial = f"{artifact_path(crashed)}.part"
+    open(partial, "w").close()
+
+    cleanup_expired_exports()
+
+    for job in (crashed, reused_pid):
+        stored = get_export_job(job["job_id"])
+        assert stored["status"] == JOB_STATUS_FAILED
+        assert stored["finished_at"] is not None
+    assert not os.path.exists(partial)
+
+
+def test_live_jobs_are_kept_however_old(export_dir):
+    mine = save_job("b1", JOB_STATUS_RUNNING, export_jobs._current_owner(), age=timedelta(days=2))
+    other_host = save_job("b2", JOB_STATUS_RUNNING, {"host": "elsewhere", "pid": 1, "token": "x"}, age=timedelta(days=2))
+
+    cleanup_expired_exports()
+
+    for job in (mine, other_host):
+        assert get_export_job(job["job_id"])["status"] == JOB_STATUS_RUNNING
+        assert os.path.exists(artifact_path(job))
+
+
+def test_finished_jobs_expire_after_ttl(export_dir):
+    old = save_job("c1", JOB_STATUS_DONE, None, age=timedelta(minutes=61))
+    recent = save_job("c2", JOB_STATUS_DONE, None, age=timedelta(minutes=5))
+
+    cleanup_expired_exports()
+
+    assert get_export_job(old["job_id"]) is None
+    assert not os.path.exists(artifact_path(old))
+    assert get_export_job(recent["job_id"]) is not None
+    assert os.path.exists(artifact_path(recent))
+
+
+def test_submitted_job_runs_to_completion(export_dir, make_event):
+    event = make_event()
+    job = export_jobs.submit_export_job(event.id, "csv", requested_by=1)
+
+    for _ in range(100):
+        stored = get_export_job(job["job_id"])
+        if stored["status"] == JOB_STATUS_DONE:
+            break
+        time.sleep(0.05)
+
+    assert stored["status"] == JOB_STATUS_DONE
+    assert stored["owner"] == export_jobs._current_owner()
+    # A sweep right after doesn't touch it
+    cleanup_expired_exports()
+    assert os.path.exists(artifact_path(stored))
@@ -0,0 +1,62 @@
+from types import SimpleNamespace
+
+from app.config import settings
+from app.core import leader
+from app.core.leader import LeaderElector
+
+
+class FakeLockConnection:
+    def __init__(self):
+        self.alive = True
+        self.closed = False
+
+    def execute(self, statement, params=None):
+        if not self.alive:
+            raise ConnectionError("server closed the connection unexpectedly")
+        return SimpleNamespace(scalar=lambda: True)
+
+    def close(self):
+        self.closed = True
+
+
+def make_elector(monkeypatch, connections):
+    engines = []
+
+    def fake_create_engine(url, **kwargs):
+        engines.append(kwargs)
+        return SimpleNamespace(connect=lambda: connections.pop(0))
+
+    monkeypatch.setattr(leader, "create_engine", fake_create_engine)
+    elector = LeaderElector("test-scheduler")
+    elector.use_advisory_lock = True
+    return elector, engines
+
+
+def test_lock_connection_has_keepalives_and_timeouts(monkeypatch):
+    monkeypatch.setattr(settings, "LEADER_HEARTBEAT_SECONDS", 5)
+    elector, engines = make_elector(monkeypatch, [FakeLockConnection()])
+
+    assert elector.heartbeat()
+
+    connect_args = engines[0]["connect_args"]
+    assert connect_args["keepalives"] == 1
+    assert connect_args["keepalives_idle"] == 5
+    assert connect_args["keepalives_interval"] == 5
+    assert connect_args["keepalives_count"] == 3
+    # Server-side keepalives release a dead leader's lock; statement_timeout bounds the ping
+    assert "tcp_keepalives_idle=5" in connect_args["options"]
+    assert "statement_timeout=5000" in connect_args["options"]
+
+
+def test_dead_lock_connection_drops_leadership(monkeypatch):
+    first = FakeLockConnection()
+    elector, _ = make_elector(monkeypatch, [first])
+    assert elector.heartbeat()
+
+    first.alive = False
+    # Reconnecting fails too (e.g. network partition)
+    monkeypatch.setattr(elector, "_acquire", lambda: False)
+
+    assert not elector.heartbeat()
+    assert not elector.is_leader
+    assert first.closed
@@ -0,0 +1,111 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.core import firebase
+from app.core.firebase import FCM_MAX_BATCH_SIZE
+from app.dependencies import get_read_db
+from app.database import Base, SessionLocal
+from app.main import app
+from app.models import Notification, User
+from app.services import batches
+from app.services.notifications import send_due_notifications
+
+
+@pytest.fixture
+def own_database(tmp_path, monkeypatch):
+    """
+    Session factory on a database of this test's own, used by the batch senders, so draining
+    the queue neither sees nor changes rows other tests left in the shared database.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'dispatch.db'}")
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autoflush=False, bind=engine)
+    monkeypatch.setattr(batches, "SessionLocal", session_factory)
+    yield session_factory
+    engine.dispose()
+
+
+def test_full_batch_goes_out_in_one_send_each_call(own_database, monkeypatch):
+    calls = []
+
+    def fake_send_each(messages):
+        calls.append(len(messages))
+        return SimpleNamespace(responses=[
+            SimpleNamespace(success=True, message_id=f"m{i}", exception=None)
+            for i in range(len(messages))
+        ])
+
+    monkeypatch.setattr(firebase, "init_firebase", lambda: None)
+    monkeypatch.setattr(firebase.messaging, "send_each", fake_send_each)
+
+    db = own_database()
+    user = User(username="dispatch", password_hash="x", is_active=True, fcm_token="token")
+    db.add(user)
+    db.commit()
+    due = datetime.utcnow() - timedelta(minutes=1)
+    db.execute(insert(Notification), [
+        {"user_id": user.id, "title": f"Reminder {i}", "body": "", "notify_at": due, "delivered": False}
+        for i in range(FCM_MAX_BATCH_SIZE)
+    ])
+    db.commit()
+
+    send_due_notifications()
+
+    assert calls == [FCM_MAX_BATCH_SIZE]
+    assert db.query(Notification).filter_by(user_id=user.id, delivered=False).count() == 0
+    db.close()
+
+
+def test_my_notifications_are_paged(client, db, make_user, auth_headers):
+    user = make_user()
+    delivered_at = datetime.utcnow()
+    db.execute(insert(Notification), [
+        # Two share a delivered_at, so the id tiebreak decides
+        {"user_id": user.id, "title": f"N{i}", "body": "", "notify_at": delivered_at, "delivered": True,
+         "delivered_at": delivered_at - timedelta(minutes=min(i, 3))}
+        for i in range(5)
+    ])
+    db.commit()
+    expected = [n.id for n in db.query(Notification).filter_by(user_id=user.id)
+                .order_by(Notification.delivered_at.desc(), Notification.id.desc())]
+
+    ids, cursor = [], None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/notifications/my", params=params, headers=auth_headers(user))
+        assert response.status_code == 200
+        assert len(response.json()) <= 2
+        ids += [n["id"] for n in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+
+    assert ids == expected
+    assert client.get("/api/notifications/my", params={"limit": 101}, headers=auth_headers(user)).status_code == 422
+
+
+@pytest.mark.parametrize("path", ["/api/notifications/my", "/api/notifications/feed", "/api/notifications/unread-count"])
+def test_read_only_notification_routes_use_read_db(client, make_user, auth_headers, path):
+    used = []
+
+    def tracking_read_db():
+        used.append(path)
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_read_db] = tracking_read_db
+    try:
+        assert client.get(path, headers=auth_headers(make_user())).status_code == 200
+    finally:
+        app.dependency_overrides.pop(get_read_db)
+
+    assert used == [path]
@@ -0,0 +1,60 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.core import pool_metrics
+from app.core.pool_metrics import TimedQueuePool, register_pool, render_pool_metrics
+
+
+@pytest.fixture
+def small_engine(tmp_path, monkeypatch):
+    monkeypatch.setattr(pool_metrics, "_engines", {})
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=TimedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.1,
+    )
+    register_pool("test", engine)
+    yield engine
+    engine.dispose()
+
+
+def metric(name: str) -> float:
+    for line in render_pool_metrics().splitlines():
+        if line.startswith(name + " "):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"{name} not rendered")
+
+
+def test_wait_and_hold_histograms_count_checkouts(small_engine):
+    for _ in range(3):
+        with small_engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+    assert metric('db_pool_checkout_wait_seconds_count{pool="test"}') == 3
+    assert metric('db_pool_connection_hold_seconds_count{pool="test"}') == 3
+    assert metric('db_pool_checked_out{pool="test"}') == 0
+
+
+def test_timeout_is_counted(small_engine):
+    with small_engine.connect():
+        with pytest.raises(PoolTimeoutError):
+            small_engine.connect()
+        assert metric('db_pool_checked_out{pool="test"}') == 1
+
+    assert metric('db_pool_checkout_timeouts_total{pool="test"}') == 1
+    # The held connection is only observed once it is returned
+    assert metric('db_pool_connection_hold_seconds_count{pool="test"}') == 1
+
+
+def test_stats_survive_dispose(small_engine):
+    with small_engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    small_engine.dispose()
+    with small_engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+    assert metric('db_pool_checkout_wait_seconds_count{pool="test"}') == 2
+    assert metric('db_pool_connection_hold_seconds_count{pool="test"}') == 2
@@ -0,0 +1,75 @@
+"""
+Query-plan regression checks for the hot-path indexes (ce1235d8fc05, 9b3e51d7a2c4).
+Runs on whatever DATABASE_URL points at: EXPLAIN QUERY PLAN on SQLite, EXPLAIN on Postgres.
+"""
+from datetime import datetime
+
+from sqlalchemy import select, text
+
+from app.models import Event, Notification, Registration
+from app.routers.events import filtered_events_query, order_upcoming_first
+from app.services.registrations import schedule_conflict_query
+
+
+def query_plan(db, stmt) -> str:
+    dialect = db.get_bind().dialect
+    sql = str(stmt.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+
+    if dialect.name == "postgresql":
+        # Test tables are tiny, so the planner would prefer a seq scan to any index
+        db.execute(text("SET LOCAL enable_seqscan = off"))
+        rows = db.execute(text(f"EXPLAIN {sql}")).scalars().all()
+    else:
+        rows = [row[-1] for row in db.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+
+    db.rollback()
+    return "\n".join(rows)
+
+
+def assert_uses_index(plan: str, *index_names: str):
+    assert any(name in plan for name in index_names), f"none of {index_names} used:\n{plan}"
+
+
+def test_event_listing_filters_use_indexes(db):
+    now = datetime(2026, 1, 1)
+
+    by_category = order_upcoming_first(filtered_events_query("Tech", None), now).limit(20)
+    assert_uses_index(query_plan(db, by_category), "ix_events_category")
+
+    by_club = order_upcoming_first(filtered_events_query(None, "Robotics"), now).limit(20)
+    assert_uses_index(query_plan(db, by_club), "ix_events_club")
+
+
+def test_registrations_by_user_uses_unique_index(db):
+    stmt = select(Registration).where(Registration.user_id == 1)
+
+    # SQLite names the index backing a UNIQUE constraint itself
+    assert_uses_index(query_plan(db, stmt), "uq_registrations_user_event", "sqlite_autoindex_registrations")
+
+
+def test_registrations_by_event_uses_index(db):
+    stmt = select(Registration).where(Registration.event_id == 1)
+
+    assert_uses_index(query_plan(db, stmt), "ix_registrations_event_id")
+
+
+def test_due_notifications_use_index(db):
+    stmt = (
+        select(Notification.id)
+        .where(Notification.delivered == False, Notification.notify_at <= datetime(2026, 1, 1))
+        .order_by(Notification.notify_at)
+    )
+
+    assert_uses_index(query_plan(db, stmt), "ix_notifications_delivered_notify_at")
+
+
+def test_events_by_creator_uses_index(db):
+    stmt = select(Event.id).where(Event.created_by == 1)
+
+    assert_uses_index(query_plan(db, stmt), "ix_events_created_by")
+
+
+def test_schedule_conflict_check_uses_time_index(db):
+    event = Event(id=1, start_time=datetime(2026, 1, 1, 10), end_time=datetime(2026, 1, 1, 12))
+
+    assert_uses_index(query_plan(db, schedule_conflict_query(1, event)), "ix_events_end_time_start_time")
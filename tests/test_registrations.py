@@ -0,0 +1,96 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.models import EmailOutbox, Notification, Registration
+from app.services.registrations import has_schedule_conflict, is_duplicate_registration
+
+
+def test_register_without_email(client, db, make_user, make_event, auth_headers):
+    user = make_user(with_email=False)
+    event = make_event()
+    queued_emails = db.query(EmailOutbox).count()
+
+    response = client.post(f"/api/registrations/events/{event.id}/register", headers=auth_headers(user))
+
+    assert response.status_code == 201
+    assert db.query(Registration).filter_by(user_id=user.id, event_id=event.id).count() == 1
+    # Push/web confirmation only, no email
+    assert db.query(Notification).filter_by(user_id=user.id, title="Registration Confirmed").count() == 1
+    assert db.query(EmailOutbox).count() == queued_emails
+
+
+def test_register_queues_confirmation_email(client, db, make_user, make_event, auth_headers):
+    user = make_user()
+    event = make_event(title="Email Event")
+
+    response = client.post(f"/api/registrations/events/{event.id}/register", headers=auth_headers(user))
+
+    assert response.status_code == 201
+    assert db.query(EmailOutbox).filter_by(to_email=user.email).count() == 1
+
+
+def test_register_twice(client, make_user, make_event, auth_headers):
+    user = make_user()
+    event = make_event()
+    headers = auth_headers(user)
+
+    assert client.post(f"/api/registrations/events/{event.id}/register", headers=headers).status_code == 201
+    response = client.post(f"/api/registrations/events/{event.id}/register", headers=headers)
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "You are already registered for this event"
+
+
+def test_is_duplicate_registration(db, make_user, make_event):
+    user = make_user()
+    event = make_event()
+    db.add(Registration(user_id=user.id, event_id=event.id))
+    db.commit()
+
+    db.add(Registration(user_id=user.id, event_id=event.id))
+    with pytest.raises(IntegrityError) as duplicate:
+        db.commit()
+    db.rollback()
+    assert is_duplicate_registration(duplicate.value)
+
+    db.add(EmailOutbox(to_email=None, subject="s", html_content="b"))
+    with pytest.raises(IntegrityError) as other:
+        db.commit()
+    db.rollback()
+    assert not is_duplicate_registration(other.value)
+
+
+@pytest.mark.parametrize("other_start, other_duration, conflict", [
+    (timedelta(hours=1), timedelta(hours=2), True),       # overlaps the end
+    (timedelta(hours=-1), timedelta(hours=2), True),      # overlaps the start
+    (timedelta(hours=-1), timedelta(hours=5), True),      # contains the event
+    (timedelta(hours=2), timedelta(hours=1), False),      # starts right when it ends
+    (timedelta(hours=-1), timedelta(hours=1), False),     # ends right when it starts
+    (timedelta(hours=-1), None, True),                    # open-ended, still running
+    (timedelta(hours=-3), None, False),                   # open-ended, over by then
+])
+def test_has_schedule_conflict(db, make_user, make_event, other_start, other_duration, conflict):
+    user = make_user()
+    start = datetime(2030, 1, 1, 10)
+    event = make_event(start_at=start, duration=timedelta(hours=2))
+    other = make_event(start_at=start + other_start, duration=other_duration)
+    db.add(Registration(user_id=user.id, event_id=other.id))
+    db.commit()
+
+    assert has_schedule_conflict(db, user.id, event) is conflict
+
+
+def test_has_schedule_conflict_open_ended_candidate(db, make_user, make_event):
+    user = make_user()
+    start = datetime(2030, 2, 1, 10)
+    event = make_event(start_at=start, duration=None)
+    other = make_event(start_at=start + timedelta(hours=1), duration=timedelta(hours=1))
+    db.add(Registration(user_id=user.id, event_id=other.id))
+    db.commit()
+
+    assert has_schedule_conflict(db, user.id, event)
+    # Another user's registration never counts, nor does the event itself
+    assert not has_schedule_conflict(db, make_user().id, event)
+    assert not has_schedule_conflict(db, user.id, other)
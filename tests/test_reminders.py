@@ -0,0 +1,149 @@
+import socket
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from sqlalchemy.exc import OperationalError
+
+from app.core import reminders, scheduler
+from app.core.reminders import ReminderQueue
+from app.models import Notification
+
+
+class FakeListenConnection:
+    """
+    psycopg2-like connection that is always readable and replays a script of poll() results.
+    """
+
+    def __init__(self, script):
+        self.script = list(script)
+        self.notifies = []
+        self.autocommit = False
+        self.closed = False
+        # A socket with unread data, so select() returns immediately
+        self._sock, peer = socket.socketpair()
+        peer.send(b"x")
+        self._peer = peer
+
+    def fileno(self):
+        return self._sock.fileno()
+
+    def cursor(self):
+        return SimpleNamespace(execute=lambda sql: None)
+
+    def poll(self):
+        step = self.script.pop(0)
+        if isinstance(step, Exception):
+            raise step
+        self.notifies.append(SimpleNamespace(payload=step.isoformat()))
+
+
+class FakeListenEngine:
+    def __init__(self, queue, connections):
+        self.queue = queue
+        self.connections = list(connections)
+
+    def raw_connection(self):
+        if not self.connections:
+            # Script exhausted: stop the listener loop
+            self.queue.running = False
+            raise OperationalError("connect", {}, Exception("done"))
+        conn = self.connections.pop(0)
+        if isinstance(conn, Exception):
+            raise conn
+        return SimpleNamespace(driver_connection=conn, close=lambda: setattr(conn, "closed", True))
+
+
+def test_listener_reconnects_and_resyncs(monkeypatch):
+    first_at = datetime.utcnow() + timedelta(hours=1)
+    second_at = datetime.utcnow() + timedelta(hours=2)
+    dropped = OperationalError("poll", {}, Exception("server closed the connection"))
+
+    queue = ReminderQueue()
+    queue.running = True
+    generation = queue._generation
+    resyncs = []
+    pushed = []
+    monkeypatch.setattr(queue, "resync", lambda: resyncs.append(1))
+    monkeypatch.setattr(queue, "push", pushed.append)
+
+    first = FakeListenConnection([first_at, dropped])
+    second = FakeListenConnection([second_at, dropped])
+    refused = OperationalError("connect", {}, Exception("connection refused"))
+    engine = FakeListenEngine(queue, [first, refused, second])
+
+    monkeypatch.setattr(reminders, "create_engine", lambda *args, **kwargs: engine)
+    sleeps = []
+    monkeypatch.setattr(reminders.time, "sleep", sleeps.append)
+
+    queue._listen(generation)
+
+    # Notifications from both connections arrived, and each (re)connect reloaded the heap
+    assert pushed == [first_at, second_at]
+    assert len(resyncs) == 2
+    assert first.closed and second.closed
+    # Backoff doubles while reconnecting fails and resets once a connection succeeds;
+    # no retry once the queue has stopped
+    assert sleeps == [1, 2, 1]
+
+
+def counting_resync(monkeypatch, queue) -> list:
+    calls = []
+    resync = queue.resync
+
+    def wrapped():
+        calls.append(1)
+        resync()
+
+    monkeypatch.setattr(queue, "resync", wrapped)
+    return calls
+
+
+def test_undelivered_due_reminder_is_not_redispatched_in_a_loop(db, make_user, monkeypatch):
+    user = make_user()
+    notification = Notification(
+        user_id=user.id, title="Due", body="",
+        notify_at=datetime.utcnow() - timedelta(minutes=1), delivered=False,
+    )
+    db.add(notification)
+    db.commit()
+
+    queue = ReminderQueue()
+    resyncs = counting_resync(monkeypatch, queue)
+    dispatches = []
+    # Dispatch that leaves the row undelivered, like run_if_leader on a standby
+    queue.start(lambda: dispatches.append(1))
+    try:
+        time.sleep(1)
+    finally:
+        queue.stop()
+        db.delete(notification)
+        db.commit()
+
+    # One dispatch for the due row; its redispatch waits REDISPATCH_DELAY_SECONDS
+    assert len(dispatches) == 1
+    assert len(resyncs) <= 2
+
+
+def test_queue_runs_only_while_leading(monkeypatch):
+    queue = ReminderQueue()
+    monkeypatch.setattr(scheduler, "reminder_queue", queue)
+    leading = [False]
+    monkeypatch.setattr(scheduler.elector, "heartbeat", lambda: leading[0])
+    queries = []
+    session_factory = reminders.SessionLocal
+    monkeypatch.setattr(reminders, "SessionLocal", lambda: queries.append(1) or session_factory())
+
+    scheduler.leader_heartbeat()
+    queue.resync()  # periodic resync job on a standby
+    assert not queue.running
+    assert queries == []
+
+    leading[0] = True
+    scheduler.leader_heartbeat()
+    assert queue.running
+    assert queries
+
+    leading[0] = False
+    scheduler.leader_heartbeat()
+    assert not queue.running
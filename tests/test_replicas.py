@@ -0,0 +1,78 @@
+import time
+
+from fastapi import Request
+
+from sqlalchemy import text
+
+from app.config import settings
+from app.core import replicas as replica_module
+from app.core.replicas import (
+    PRIMARY_PIN_COOKIE,
+    PRIMARY_PIN_HEADER,
+    ReplicaSet,
+    is_primary_pinned,
+    primary_pin_value,
+    read_session,
+    replica_connect_args,
+)
+from app.database import engine as primary_engine
+from app.dependencies import pinned_to_primary
+
+
+def make_request(headers: dict) -> Request:
+    return Request({
+        "type": "http",
+        "headers": [(name.lower().encode(), value.encode()) for name, value in headers.items()],
+    })
+
+
+def test_primary_pin_expires(monkeypatch):
+    monkeypatch.setattr(settings, "READ_YOUR_WRITES_SECONDS", 10)
+
+    assert is_primary_pinned(primary_pin_value())
+    assert not is_primary_pinned(str(int(time.time()) - 1))
+    assert not is_primary_pinned(None)
+    assert not is_primary_pinned("garbage")
+
+
+def test_pin_is_read_from_the_request():
+    """
+    The pin travels with the client, so any worker can honour it.
+    """
+    pin = primary_pin_value()
+
+    assert not pinned_to_primary(make_request({}))
+    assert pinned_to_primary(make_request({PRIMARY_PIN_HEADER: pin}))
+    assert pinned_to_primary(make_request({"Cookie": f"{PRIMARY_PIN_COOKIE}={pin}"}))
+
+
+def test_replica_connections_time_out(monkeypatch):
+    monkeypatch.setattr(settings, "REPLICA_CONNECT_TIMEOUT_SECONDS", 3)
+    monkeypatch.setattr(settings, "REPLICA_STATEMENT_TIMEOUT_SECONDS", 30)
+
+    connect_args = replica_connect_args("postgresql+psycopg2://replica/app")
+    assert connect_args["connect_timeout"] == 3
+    assert connect_args["keepalives"] == 1
+    assert "statement_timeout=30000" in connect_args["options"]
+
+    async_args = replica_connect_args("postgresql+asyncpg://replica/app")
+    assert async_args["timeout"] == 3
+    assert async_args["server_settings"]["statement_timeout"] == "30000"
+
+    assert replica_connect_args("sqlite:///replica.db") == {}
+
+
+def test_unreachable_replica_falls_back_to_primary(monkeypatch, tmp_path):
+    # A replica URL that can't be opened
+    replicas = ReplicaSet([f"sqlite:///{tmp_path / 'missing' / 'replica.db'}"])
+    monkeypatch.setattr(replicas, "_start_monitor", lambda: None)
+    monkeypatch.setattr(replica_module, "replica_set", replicas)
+
+    db = read_session()
+    try:
+        assert db.get_bind() is primary_engine
+        assert db.execute(text("SELECT 1")).scalar() == 1
+    finally:
+        db.close()
+    # Skipped until the next successful health check
+    assert replicas.pick() is None
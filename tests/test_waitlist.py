@@ -0,0 +1,50 @@
+from datetime import timedelta
+
+from app.models import EmailOutbox, Event, Notification, Registration, WaitlistEntry
+
+
+def test_unregister_promotes_next_without_conflict(client, db, make_user, make_event, auth_headers):
+    event = make_event(start_in=timedelta(days=10), capacity=1, title="Full Event")
+    overlapping = make_event(start_in=timedelta(days=10, hours=1), title="Overlapping Event")
+    leaving, conflicted, promoted = make_user(), make_user(), make_user()
+
+    assert client.post(f"/api/registrations/events/{event.id}/register", headers=auth_headers(leaving)).status_code == 201
+    assert client.post(f"/api/registrations/events/{overlapping.id}/register", headers=auth_headers(conflicted)).status_code == 201
+    for user in (conflicted, promoted):
+        assert client.post(f"/api/registrations/events/{event.id}/waitlist", headers=auth_headers(user)).status_code == 201
+
+    response = client.delete(f"/api/registrations/events/{event.id}/register", headers=auth_headers(leaving))
+    assert response.status_code == 200
+
+    registered = {r.user_id for r in db.query(Registration).filter_by(event_id=event.id)}
+    # The head of the queue overlaps another registration, so the next one gets the seat
+    assert registered == {promoted.id}
+    db.refresh(event)
+    assert event.registered_count == 1
+    assert db.query(WaitlistEntry).filter_by(event_id=event.id).count() == 0
+    assert db.query(Notification).filter_by(user_id=conflicted.id, title="Removed from waitlist").count() == 1
+
+    # Same confirmation as a direct registration: push/web notification, email and reminders
+    assert db.query(Notification).filter_by(user_id=promoted.id, title="You're off the waitlist!").count() == 1
+    assert db.query(Notification).filter(
+        Notification.user_id == promoted.id,
+        Notification.title.like("Upcoming Tomorrow%")
+    ).count() == 1
+    assert db.query(EmailOutbox).filter_by(to_email=promoted.email).count() == 1
+
+
+def test_deleting_a_user_promotes_the_waitlist(client, db, make_user, make_event, auth_headers):
+    admin = make_user(is_admin=True)
+    event = make_event(start_in=timedelta(days=10), capacity=1, title="Full Event")
+    deleted, waiting = make_user(), make_user()
+
+    assert client.post(f"/api/registrations/events/{event.id}/register", headers=auth_headers(deleted)).status_code == 201
+    assert client.post(f"/api/registrations/events/{event.id}/waitlist", headers=auth_headers(waiting)).status_code == 201
+
+    assert client.delete(f"/api/users/{deleted.id}", headers=auth_headers(admin)).status_code == 200
+
+    db.expire_all()
+    assert {r.user_id for r in db.query(Registration).filter_by(event_id=event.id)} == {waiting.id}
+    assert db.get(Event, event.id).registered_count == 1
+    assert db.query(WaitlistEntry).filter_by(event_id=event.id).count() == 0
+    assert db.query(Notification).filter_by(user_id=waiting.id, title="You're off the waitlist!").count() == 1